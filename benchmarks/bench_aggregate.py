@@ -0,0 +1,78 @@
+"""Benchmark rolling-window statistics against recomputing them.
+
+Feeds one reading per second and queries the 1 minute, 15 minute and 24 hour
+windows after every reading, once recomputed from the stored readings and
+once from a RollingAggregator.
+
+Usage:
+    poetry run python benchmarks/bench_aggregate.py [readings]
+"""
+
+import math
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from iometer import Reading
+from iometer.aggregate import DEFAULT_WINDOWS, RollingAggregator
+from iometer.reading import Meter, MeterReading, Register
+
+
+def make_readings(count: int) -> list[Reading]:
+    """Create one reading per second with varying power."""
+    start = datetime(2024, 11, 11, tzinfo=timezone.utc)
+    return [
+        Reading(
+            meter=Meter(
+                number="1ISK0000000000",
+                reading=MeterReading(
+                    time=start + timedelta(seconds=index),
+                    registers=[
+                        Register(Reading.TOTAL_CONSUMPTION_OBIS, index / 10, "Wh"),
+                        Register(Reading.CURRENT_POWER_OBIS, index * 7 % 500, "W"),
+                    ],
+                ),
+            )
+        )
+        for index in range(count)
+    ]
+
+
+def recompute(history: list[Reading], window: float) -> tuple[float, float, float]:
+    """Get min, max and mean power of a window by walking the history."""
+    end = history[-1].meter.reading.time.timestamp()
+    powers = [
+        reading.get_current_power()
+        for reading in reversed(history)
+        if reading.meter.reading.time.timestamp() > end - window
+    ]
+    return min(powers), max(powers), sum(powers) / len(powers)
+
+
+def main(count: int) -> None:
+    """Time both approaches and check they agree."""
+    readings = make_readings(count)
+
+    start = time.perf_counter()
+    history: list[Reading] = []
+    for reading in readings:
+        history.append(reading)
+        expected = [recompute(history, window) for window in DEFAULT_WINDOWS]
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregator = RollingAggregator()
+    for reading in readings:
+        aggregator.add(reading)
+        stats = aggregator.meters["1ISK0000000000"].all_stats()
+    incremental = time.perf_counter() - start
+
+    for item, (low, high, mean) in zip(stats.values(), expected):
+        assert (item.min_power, item.max_power) == (low, high)
+        assert math.isclose(item.mean_power, mean)
+    print(f"  recompute: {naive / count * 1e6:10.1f} us per reading")
+    print(f"incremental: {incremental / count * 1e6:10.1f} us per reading")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,81 @@
+"""Benchmark the 15 minute load profile of a day of 1 Hz readings.
+
+Compares a loop over Reading objects with iometer.analytics on a
+ReadingBatch of the same readings.
+
+Usage:
+    poetry run python benchmarks/bench_analytics.py [seconds]
+"""
+
+import math
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from iometer import ReadingBatch, analytics
+from iometer.reading import Meter, MeterReading, Reading, Register
+
+
+def make_readings(count: int) -> list[Reading]:
+    """Create count readings one second apart."""
+    start = datetime(2024, 11, 11, tzinfo=timezone.utc)
+    return [
+        Reading(
+            meter=Meter(
+                number="1ISK0000000000",
+                reading=MeterReading(
+                    time=start + timedelta(seconds=i),
+                    registers=[
+                        Register(Reading.TOTAL_CONSUMPTION_OBIS, i * 0.3, "Wh"),
+                        Register(Reading.TOTAL_PRODUCTION_OBIS, i * 0.1, "Wh"),
+                        Register(Reading.CURRENT_POWER_OBIS, 1080.0, "W"),
+                    ],
+                ),
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def naive_profile(readings: list[Reading], period: int = 900) -> dict[int, float]:
+    """Compute the load profile by walking Reading objects."""
+    profile: dict[int, float] = {}
+    previous = previous_epoch = None
+    for reading in readings:
+        consumption = reading.get_total_consumption()
+        epoch = int(reading.meter.reading.time.timestamp())
+        if previous is not None and consumption is not None:
+            bucket = previous_epoch // period * period
+            profile[bucket] = profile.get(bucket, 0.0) + consumption - previous
+        previous, previous_epoch = consumption, epoch
+    return profile
+
+
+def main(count: int) -> None:
+    """Time both variants."""
+    readings = make_readings(count)
+
+    start = time.perf_counter()
+    naive = naive_profile(readings)
+    naive_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ReadingBatch.from_readings(readings)
+    build_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    profile = analytics.load_profile(batch)
+    batch_elapsed = time.perf_counter() - start
+
+    assert all(
+        math.isclose(naive.get(bucket, 0.0), energy, abs_tol=1e-6)
+        for bucket, energy in zip(profile.starts, profile.energy)
+        if not math.isnan(energy)
+    )
+    print(f"   naive loop: {naive_elapsed * 1e3:8.1f} ms")
+    print(f" batch build: {build_elapsed * 1e3:8.1f} ms (once per batch)")
+    print(f"   analytics: {batch_elapsed * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 86400)
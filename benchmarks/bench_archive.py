@@ -0,0 +1,84 @@
+"""Benchmark replaying an NDJSON archive of readings.
+
+Compares reading the whole file and calling Reading.from_json per line with
+the streaming, batch decoding helpers of iometer.archive.
+
+Usage:
+    poetry run python benchmarks/bench_archive.py [readings]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from iometer import Reading, archive
+from iometer.reading import Meter, MeterReading, Register
+
+
+def make_readings(count: int) -> list[Reading]:
+    """Create readings of two meters, one every ten seconds."""
+    start = datetime(2024, 11, 11, tzinfo=timezone.utc)
+    return [
+        Reading(
+            meter=Meter(
+                number=f"1ISK000000000{index % 2}",
+                reading=MeterReading(
+                    time=start + timedelta(seconds=10 * index),
+                    registers=[
+                        Register("01-00:01.08.00*ff", 1000.0 + index, "Wh"),
+                        Register("01-00:02.08.00*ff", 500.0 + index, "Wh"),
+                        Register("01-00:10.07.00*ff", 360.0, "W"),
+                    ]
+                    + [
+                        Register(f"01-00:{32 + i:02d}.07.00*ff", 230.0, "V")
+                        for i in range(10)
+                    ],
+                ),
+            )
+        )
+        for index in range(count)
+    ]
+
+
+def timed(label: str, function) -> None:
+    """Print the duration of calling function."""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>32}: {elapsed * 1e3:8.1f} ms, {len(result)} readings")
+
+
+def main(count: int) -> None:
+    """Write an archive and replay it in several ways."""
+    readings = make_readings(count)
+    end = datetime(2024, 11, 11, tzinfo=timezone.utc) + timedelta(seconds=count)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("readings.ndjson", "readings.ndjson.gz"):
+            path = Path(directory) / name
+            archive.write_ndjson(path, readings)
+            print(f"{name} ({path.stat().st_size / 1e6:.1f} MB):")
+            if name.endswith(".ndjson"):
+                timed(
+                    "from_json per line",
+                    lambda path=path: [
+                        Reading.from_json(line)
+                        for line in path.read_text().splitlines()
+                    ],
+                )
+            timed("read_readings", lambda path=path: list(archive.read_readings(path)))
+            timed(
+                "read_reading_batch",
+                lambda path=path: archive.read_reading_batch(path),
+            )
+            timed(
+                "read_readings, one meter, 10%",
+                lambda path=path: list(
+                    archive.read_readings(path, end=end, meter_number="1ISK0000000000")
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
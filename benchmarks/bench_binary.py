@@ -0,0 +1,61 @@
+"""Benchmark the binary encoding of readings against JSON.
+
+Usage:
+    poetry run python benchmarks/bench_binary.py [readings]
+"""
+
+import gzip
+import sys
+import time
+
+from bench_archive import make_readings
+
+from iometer import Reading, binary
+
+
+def timed(label: str, function) -> None:
+    """Print the duration per reading of calling function."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:>24}: {elapsed / COUNT * 1e6:8.2f} us per reading")
+
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+
+def main() -> None:
+    """Compare size and speed of JSON, single and streamed binary readings."""
+    readings = make_readings(COUNT)
+    lines = [reading.to_json() for reading in readings]
+    frames = [reading.to_bytes() for reading in readings]
+    json_data = "\n".join(lines).encode()
+    stream = binary.dumps_readings(readings, delta=False)
+    delta_stream = binary.dumps_readings(readings)
+
+    print("bytes per reading (plain, gzip):")
+    for label, data in (
+        ("JSON lines", json_data),
+        ("binary, single", b"".join(frames)),
+        ("binary stream", stream),
+        ("binary stream, delta", delta_stream),
+    ):
+        print(
+            f"  {label:>24}: {len(data) / COUNT:8.1f} "
+            f"{len(gzip.compress(data)) / COUNT:8.1f}"
+        )
+
+    print("encode:")
+    timed("to_json", lambda: [reading.to_json() for reading in readings])
+    timed("to_bytes", lambda: [reading.to_bytes() for reading in readings])
+    timed("dumps_readings", lambda: binary.dumps_readings(readings, delta=False))
+    timed("dumps_readings, delta", lambda: binary.dumps_readings(readings))
+    print("decode:")
+    timed("from_json", lambda: [Reading.from_json(line) for line in lines])
+    timed("from_bytes", lambda: [Reading.from_bytes(frame) for frame in frames])
+    timed("loads_readings", lambda: binary.loads_readings(stream))
+    timed("loads_readings, delta", lambda: binary.loads_readings(delta_stream))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark decoding a backlog of reading payloads on a process pool.
+
+Usage:
+    poetry run python benchmarks/bench_bulk.py [payloads]
+"""
+
+import os
+import sys
+import time
+
+from bench_archive import make_readings
+
+from iometer import Reading, bulk
+
+
+def timed(label: str, function) -> float:
+    """Print and return the duration of calling function."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>32}: {elapsed * 1e3:8.1f} ms")
+    return elapsed
+
+
+def main(count: int) -> None:
+    """Decode the same payloads with an increasing number of workers."""
+    payloads = [reading.to_json() for reading in make_readings(count)]
+    timed("from_json", lambda: [Reading.from_json(payload) for payload in payloads])
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        timed(
+            f"decode_readings, {workers} workers",
+            lambda workers=workers: bulk.decode_readings(payloads, max_workers=workers),
+        )
+        timed(
+            f"decode_reading_rows, {workers} workers",
+            lambda workers=workers: bulk.decode_reading_rows(
+                payloads, max_workers=workers
+            ),
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,79 @@
+"""Benchmark IOmeterClient request throughput against a local HTTP server.
+
+Compares the previous request path (URL and headers rebuilt per call, default
+ClientSession) with the tuned client session and precomputed endpoints.
+
+Usage:
+    poetry run python benchmarks/bench_client.py [requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from aiohttp import ClientSession, web
+from yarl import URL
+
+from iometer import IOmeterClient
+
+PAYLOAD = (
+    '{"__typename": "iometer.reading.v1", "meter": {"number": "1ISK0000000000", '
+    '"reading": {"time": "2024-11-11T11:11:11Z", "registers": ['
+    '{"obis": "01-00:01.08.00*ff", "value": 1234.5, "unit": "Wh"}, '
+    '{"obis": "01-00:02.08.00*ff", "value": 5432.1, "unit": "Wh"}, '
+    '{"obis": "01-00:10.07.00*ff", "value": 100, "unit": "W"}]}}}'
+)
+
+
+async def handle_reading(_request: web.Request) -> web.Response:
+    """Serve a static reading."""
+    return web.Response(text=PAYLOAD, content_type="application/json")
+
+
+async def legacy_requests(port: int, count: int) -> float:
+    """Issue requests the way the client did before connection tuning."""
+    async with ClientSession() as session:
+        start = time.perf_counter()
+        for _ in range(count):
+            url = URL.build(scheme="http", host="127.0.0.1", port=port).joinpath(
+                "v1/reading"
+            )
+            headers = {
+                "User-Agent": "PythonIOmeter/0.1",
+                "Accept": "application/json",
+            }
+            response = await session.get(url, headers=headers)
+            response.raise_for_status()
+            await response.text()
+        return time.perf_counter() - start
+
+
+async def client_requests(port: int, count: int) -> float:
+    """Issue requests through the current client."""
+    async with IOmeterClient("127.0.0.1", port=port) as client:
+        start = time.perf_counter()
+        for _ in range(count):
+            await client._request("v1/reading")  # pylint: disable=protected-access
+        return time.perf_counter() - start
+
+
+async def main(count: int) -> None:
+    """Run both variants against the same local server."""
+    app = web.Application()
+    app.router.add_get("/v1/reading", handle_reading)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+
+    try:
+        for name, bench in (("legacy", legacy_requests), ("client", client_requests)):
+            elapsed = await bench(port, count)
+            print(f"{name:>8}: {count / elapsed:10.0f} requests/sec")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,66 @@
+"""Benchmark Reading and Status decoding with each installed JSON backend.
+
+Usage:
+    poetry run python benchmarks/bench_codec.py [payloads]
+"""
+
+import json
+import sys
+import time
+
+from iometer import Reading, Status, codec
+
+READING = json.dumps(
+    {
+        "__typename": "iometer.reading.v1",
+        "meter": {
+            "number": "1ISK0000000000",
+            "reading": {
+                "time": "2024-11-11T11:11:11Z",
+                "registers": [
+                    {"obis": "01-00:01.08.00*ff", "value": 1234.5, "unit": "Wh"},
+                    {"obis": "01-00:02.08.00*ff", "value": 5432.1, "unit": "Wh"},
+                    {"obis": "01-00:10.07.00*ff", "value": 100, "unit": "W"},
+                ],
+            },
+        },
+    }
+)
+
+STATUS = json.dumps(
+    {
+        "__typename": "iometer.status.v1",
+        "meter": {"number": "1ISK0000000000"},
+        "device": {
+            "bridge": {"rssi": -30, "version": "build-65"},
+            "id": "658c2b34-2017-45f2-a12b-731235f8bb97",
+            "core": {
+                "connectionStatus": "connected",
+                "rssi": -30,
+                "version": "build-58",
+                "powerStatus": "battery",
+                "batteryLevel": 100,
+                "attachmentStatus": "attached",
+                "pinStatus": "entered",
+            },
+        },
+    }
+)
+
+
+def main(count: int) -> None:
+    """Decode count payloads of each type with every backend."""
+    for backend in codec.available_backends():
+        codec.set_backend(backend)
+        for cls, payload in ((Reading, READING), (Status, STATUS)):
+            start = time.perf_counter()
+            for _ in range(count):
+                cls.from_json(payload)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{backend:>8} {cls.__name__:>8}: {count / elapsed:10.0f} payloads/sec"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,36 @@
+"""Benchmark IOmeterClient against local fake bridges over real HTTP.
+
+Usage:
+    poetry run python benchmarks/bench_fake_bridge.py [bridges] [requests]
+"""
+
+import asyncio
+import sys
+
+from iometer.mock_bridge import run_benchmark
+
+
+async def main(bridges: int, requests_per_bridge: int) -> None:
+    """Run the benchmark with and without simulated bridge latency."""
+    for latency, jitter in ((0.0, 0.0), (0.02, 0.01)):
+        result = await run_benchmark(
+            bridges=bridges,
+            requests_per_bridge=requests_per_bridge,
+            latency=latency,
+            jitter=jitter,
+            register_count=20,
+        )
+        print(
+            f"latency {latency * 1e3:4.0f} ms: {result.requests_per_second:8.0f} req/s, "
+            f"p50 {result.p50 * 1e3:6.2f} ms, p99 {result.p99 * 1e3:6.2f} ms, "
+            f"{result.errors} errors"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        )
+    )
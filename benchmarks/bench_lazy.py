@@ -0,0 +1,58 @@
+"""Benchmark eager and lazy reading parsing for power-only consumers.
+
+Usage:
+    poetry run python benchmarks/bench_lazy.py [registers] [backend]
+"""
+
+import json
+import sys
+import timeit
+
+from iometer import Reading, codec
+
+
+def make_payload(count: int) -> str:
+    """Create a reading payload with count additional registers."""
+    registers = [
+        {"obis": "01-00:01.08.00*ff", "value": 1234.5, "unit": "Wh"},
+        {"obis": "01-00:02.08.00*ff", "value": 5432.1, "unit": "Wh"},
+        {"obis": "01-00:10.07.00*ff", "value": 100, "unit": "W"},
+    ]
+    registers += [
+        {
+            "obis": f"01-00:{32 + i % 40:02d}.07.{i // 40:02d}*ff",
+            "value": 230.0,
+            "unit": "V",
+        }
+        for i in range(count)
+    ]
+    return json.dumps(
+        {
+            "__typename": "iometer.reading.v1",
+            "meter": {
+                "number": "1ISK0000000000",
+                "reading": {"time": "2024-11-11T11:11:11Z", "registers": registers},
+            },
+        }
+    )
+
+
+def main(count: int, backend: str | None = None) -> None:
+    """Time parsing plus get_current_power with a JSON backend."""
+    print(f"backend: {codec.set_backend(backend)}")
+    payload = make_payload(count)
+    number = 20000
+    for lazy in (False, True):
+        elapsed = timeit.timeit(
+            lambda lazy=lazy: Reading.from_json(payload, lazy=lazy).get_current_power(),
+            number=number,
+        )
+        name = "lazy" if lazy else "eager"
+        print(f"{name:>6}: {elapsed / number * 1e6:8.2f} us per reading")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+    )
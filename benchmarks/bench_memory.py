@@ -0,0 +1,131 @@
+"""Benchmark the memory footprint of Reading objects.
+
+Compares the slotted models with equivalent plain dataclasses that carry a
+per-instance __dict__, as the models did before, and readings decoded from
+JSON with registers holding their own OBIS and unit strings against the
+interned strings used by Reading.from_json.
+
+Usage:
+    poetry run python benchmarks/bench_memory.py [readings]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from iometer.reading import Meter, MeterReading, Reading, Register
+
+
+@dataclass
+class PlainRegister:
+    """Register without slots."""
+
+    obis: str
+    value: float
+    unit: str
+
+
+@dataclass
+class PlainMeterReading:
+    """MeterReading without slots."""
+
+    time: datetime
+    registers: list
+
+
+@dataclass
+class PlainMeter:
+    """Meter without slots."""
+
+    number: str
+    reading: PlainMeterReading
+
+
+@dataclass
+class PlainReading:
+    """Reading without slots."""
+
+    meter: PlainMeter
+
+
+REGISTERS = [
+    ("01-00:01.08.00*ff", "Wh"),
+    ("01-00:02.08.00*ff", "Wh"),
+    ("01-00:10.07.00*ff", "W"),
+]
+
+
+def build(
+    count: int,
+    register: Callable,
+    meter_reading: Callable,
+    meter: Callable,
+    reading: Callable,
+) -> list[Any]:
+    """Build count readings out of the given model classes."""
+    start = datetime(2024, 11, 11, tzinfo=timezone.utc)
+    return [
+        reading(
+            meter=meter(
+                number="1ISK0000000000",
+                reading=meter_reading(
+                    time=start + timedelta(seconds=i),
+                    registers=[
+                        register(obis=obis, value=float(i), unit=unit)
+                        for obis, unit in REGISTERS
+                    ],
+                ),
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def measure(count: int, *models: Callable) -> float:
+    """Get the number of bytes allocated per reading."""
+    tracemalloc.start()
+    readings = build(count, *models)
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del readings
+    return size / count
+
+
+def copied_register(obis: str, value: float, unit: str) -> Register:
+    """Create a register with its own copies of the strings, like a decoder."""
+    return Register(obis=obis[:1] + obis[1:], value=value, unit=unit[:1] + unit[1:])
+
+
+def measure_decoded(count: int) -> float:
+    """Get the number of bytes allocated per reading decoded from JSON."""
+    payloads = [
+        reading.to_json()
+        for reading in build(count, Register, MeterReading, Meter, Reading)
+    ]
+    tracemalloc.start()
+    readings = [Reading.from_json(payload) for payload in payloads]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del readings
+    return size / count
+
+
+def main(count: int) -> None:
+    """Measure the model variants."""
+    plain = measure(count, PlainRegister, PlainMeterReading, PlainMeter, PlainReading)
+    slotted = measure(count, Register, MeterReading, Meter, Reading)
+    copied = measure(count, copied_register, MeterReading, Meter, Reading)
+    decoded = measure_decoded(count)
+    for label, size in (
+        ("plain", plain),
+        ("slotted", slotted),
+        ("copied strings", copied),
+        ("from_json interned", decoded),
+    ):
+        print(f"{label:>18}: {size:8.0f} bytes per reading")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,78 @@
+"""Benchmark OBIS register lookups on readings with many registers.
+
+Compares a linear scan over the registers with the indexed lookup of
+MeterReading for all getters of Reading.
+
+Usage:
+    poetry run python benchmarks/bench_obis.py [registers]
+"""
+
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from iometer.reading import Meter, MeterReading, Reading, Register
+
+
+def make_reading(count: int) -> Reading:
+    """Create a reading with count registers, the well-known ones last."""
+    registers = [
+        Register(obis=f"01-00:{32 + i % 40:02d}.07.{i // 40:02d}*ff", value=i, unit="V")
+        for i in range(count)
+    ]
+    registers += [
+        Register(obis=Reading.TOTAL_CONSUMPTION_OBIS, value=1234.5, unit="Wh"),
+        Register(obis=Reading.TOTAL_PRODUCTION_OBIS, value=5432.1, unit="Wh"),
+        Register(obis=Reading.CURRENT_POWER_OBIS_ALT, value=100, unit="W"),
+    ]
+    return Reading(
+        meter=Meter(
+            number="1ISK0000000000",
+            reading=MeterReading(time=datetime.now(timezone.utc), registers=registers),
+        )
+    )
+
+
+def linear_features(reading: Reading) -> tuple:
+    """Extract features with a linear scan per lookup."""
+    registers = reading.meter.reading.registers
+
+    def value(obis: str) -> float | None:
+        register = next((reg for reg in registers if reg.obis == obis), None)
+        return register.value if register else None
+
+    power = value(Reading.CURRENT_POWER_OBIS)
+    if power is None:
+        power = value(Reading.CURRENT_POWER_OBIS_ALT)
+    return (
+        value(Reading.TOTAL_CONSUMPTION_OBIS),
+        value(Reading.TOTAL_PRODUCTION_OBIS),
+        value(Reading.CONSUMPTION_TARIFF_T1_OBIS),
+        value(Reading.CONSUMPTION_TARIFF_T2_OBIS),
+        power,
+    )
+
+
+def indexed_features(reading: Reading) -> tuple:
+    """Extract features with the Reading getters."""
+    return (
+        reading.get_total_consumption(),
+        reading.get_total_production(),
+        reading.get_consumption_tariff_T1(),
+        reading.get_consumption_tariff_T2(),
+        reading.get_current_power(),
+    )
+
+
+def main(count: int) -> None:
+    """Time both variants on the same reading."""
+    reading = make_reading(count)
+    assert linear_features(reading) == indexed_features(reading)
+    number = 20000
+    for name, func in (("linear", linear_features), ("indexed", indexed_features)):
+        elapsed = timeit.timeit(lambda f=func: f(reading), number=number)
+        print(f"{name:>8}: {elapsed / number * 1e6:8.2f} us per reading")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,68 @@
+"""Benchmark writing readings one by one against the batched pipeline.
+
+Writes every reading to an NDJSON file with one write and flush per reading,
+as a collector writing each reading as it arrives does, and then through a
+WriterPipeline with an NDJSONSink.
+
+Usage:
+    poetry run python benchmarks/bench_pipeline.py [readings]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_archive import make_readings
+
+from iometer import Reading, archive
+from iometer.pipeline import NDJSONSink, WriterPipeline
+
+
+async def write_each(path: Path, readings: list[Reading]) -> None:
+    """Write and flush every reading on its own, off the event loop."""
+    with open(path, "ab") as file:
+        for reading in readings:
+            data = reading.to_json().encode() + b"\n"
+            await asyncio.to_thread(file.write, data)
+            await asyncio.to_thread(file.flush)
+
+
+async def write_batched(path: Path, readings: list[Reading]) -> WriterPipeline:
+    """Write the readings through a pipeline."""
+    async with WriterPipeline([NDJSONSink(path)], max_batch_size=500) as pipeline:
+        for reading in readings:
+            await pipeline.put(reading)
+    return pipeline
+
+
+def main(count: int) -> None:
+    """Time both approaches and check they write the same lines."""
+    readings = make_readings(count)
+    with tempfile.TemporaryDirectory() as directory:
+        each_path = Path(directory) / "each.ndjson"
+        batched_path = Path(directory) / "batched.ndjson"
+
+        start = time.perf_counter()
+        asyncio.run(write_each(each_path, readings))
+        each = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pipeline = asyncio.run(write_batched(batched_path, readings))
+        batched = time.perf_counter() - start
+
+        assert list(archive.iter_lines(each_path)) == list(
+            archive.iter_lines(batched_path)
+        )
+    stats = pipeline.stats
+    print(f"    per item: {each / count * 1e6:8.1f} us per reading")
+    print(f"     batched: {batched / count * 1e6:8.1f} us per reading")
+    print(
+        f"     batches: {stats.batches}, max queue depth {stats.max_queue_depth}, "
+        f"mean flush {stats.mean_flush_latency * 1e3:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,99 @@
+"""Benchmark the PollScheduler against polling all bridges in lockstep.
+
+Polls many clients of a fake bridge once per second for a few seconds.
+The lockstep loop sends the requests of all clients at the start of every
+second, the scheduler spreads them over the second and caps the requests in
+flight. Prints the peak number of concurrent requests and how late polls
+started against their schedule.
+
+Usage:
+    poetry run python benchmarks/bench_scheduler.py [clients] [seconds]
+"""
+
+import asyncio
+import sys
+import time
+
+from iometer import IOmeterClient, PollScheduler, PollTarget
+from iometer.client import create_session
+from iometer.mock_bridge import FakeBridge
+from iometer.reading import Reading
+from iometer.scheduler import READING, LatenessStats
+
+
+class CountingClient:
+    """Client wrapper counting the requests in flight of all clients."""
+
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, client: IOmeterClient) -> None:
+        self.client = client
+        self.host = client.host
+
+    async def get_current_reading(self) -> Reading:
+        CountingClient.in_flight += 1
+        CountingClient.peak = max(CountingClient.peak, CountingClient.in_flight)
+        try:
+            return await self.client.get_current_reading()
+        finally:
+            CountingClient.in_flight -= 1
+
+
+async def lockstep(clients: list[CountingClient], seconds: int) -> LatenessStats:
+    """Poll all clients at the start of every second."""
+    stats = LatenessStats()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def poll(client: CountingClient, due: float) -> None:
+        stats.observe(max(loop.time() - due, 0.0))
+        await client.get_current_reading()
+
+    for second in range(seconds):
+        due = start + second
+        await asyncio.sleep(max(due - loop.time(), 0.0))
+        await asyncio.gather(*(poll(client, due) for client in clients))
+    return stats
+
+
+async def scheduled(clients: list[CountingClient], seconds: int) -> LatenessStats:
+    """Poll all clients through a staggered, capped scheduler."""
+    targets = [PollTarget(client, status_interval=None) for client in clients]
+    async with PollScheduler(
+        targets, lambda result: None, max_in_flight=20
+    ) as scheduler:
+        await asyncio.sleep(seconds)
+    return scheduler.stats[READING]
+
+
+async def run(count: int, seconds: int) -> None:
+    """Run both approaches against the same fake bridge."""
+    async with FakeBridge(latency=0.005) as bridge:
+        session = create_session(limit=count)
+        try:
+            for name, poll in (("lockstep", lockstep), ("scheduler", scheduled)):
+                clients = [
+                    CountingClient(bridge.client(session=session)) for _ in range(count)
+                ]
+                CountingClient.peak = 0
+                start = time.perf_counter()
+                stats = await poll(clients, seconds)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{name:>10}: {stats.count / elapsed:7.1f} polls/s, "
+                    f"peak in flight {CountingClient.peak:4d}, lateness "
+                    f"mean {stats.mean * 1e3:6.1f} ms, p99 {stats.p99 * 1e3:6.1f} ms, "
+                    f"max {stats.max * 1e3:6.1f} ms"
+                )
+        finally:
+            await session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        run(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+        )
+    )
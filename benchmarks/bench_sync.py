@@ -0,0 +1,53 @@
+"""Benchmark IOmeterSyncClient against asyncio.run() per request.
+
+A fake bridge runs on an event loop in a separate thread. The legacy
+pattern creates a new event loop, session and connection for every call,
+the sync client reuses one of each.
+
+Usage:
+    poetry run python benchmarks/bench_sync.py [requests]
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+from iometer import IOmeterClient, IOmeterSyncClient
+from iometer.mock_bridge import FakeBridge
+
+
+def main(requests: int) -> None:
+    """Poll the fake bridge with both patterns."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    bridge = FakeBridge()
+    asyncio.run_coroutine_threadsafe(bridge.start(), loop).result()
+
+    async def poll_once() -> None:
+        async with IOmeterClient(bridge.host, port=bridge.port) as client:
+            await client.get_current_reading()
+
+    try:
+        start = time.perf_counter()
+        for _ in range(requests):
+            asyncio.run(poll_once())
+        legacy = time.perf_counter() - start
+
+        with IOmeterSyncClient(bridge.host, port=bridge.port) as client:
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get_current_reading()
+            shared = time.perf_counter() - start
+    finally:
+        asyncio.run_coroutine_threadsafe(bridge.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    print(f"  asyncio.run per call: {legacy / requests * 1e3:8.3f} ms per request")
+    print(f"     IOmeterSyncClient: {shared / requests * 1e3:8.3f} ms per request")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
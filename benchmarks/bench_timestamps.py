@@ -0,0 +1,49 @@
+"""Benchmark parsing and formatting of reading timestamps.
+
+Compares the fromisoformat and strftime calls previously used by Reading
+with iometer.timestamps, for repeated and for distinct timestamps.
+
+Usage:
+    poetry run python benchmarks/bench_timestamps.py [count]
+"""
+
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from iometer.timestamps import format_timestamp, parse_timestamp
+
+
+def main(count: int) -> None:
+    """Time both implementations on count timestamps."""
+    start = datetime(2024, 11, 11, tzinfo=timezone.utc)
+    distinct = [start + timedelta(seconds=second) for second in range(count)]
+    cases = {
+        "repeated": [start] * count,
+        "distinct": distinct,
+    }
+    for name, times in cases.items():
+        strings = [time.strftime("%Y-%m-%dT%H:%M:%SZ") for time in times]
+        timings = {
+            "parse fromisoformat": lambda strings=strings: [
+                datetime.fromisoformat(value.replace("Z", "+00:00"))
+                for value in strings
+            ],
+            "parse_timestamp": lambda strings=strings: [
+                parse_timestamp(value) for value in strings
+            ],
+            "format strftime": lambda times=times: [
+                time.strftime("%Y-%m-%dT%H:%M:%SZ") for time in times
+            ],
+            "format_timestamp": lambda times=times: [
+                format_timestamp(time) for time in times
+            ],
+        }
+        print(f"{name} timestamps:")
+        for label, function in timings.items():
+            elapsed = min(timeit.repeat(function, number=1, repeat=5))
+            print(f"  {label:>20}: {elapsed / count * 1e9:8.1f} ns each")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,23 +1,38 @@
 """Asynchronous Python client for IOmeter."""
 
+from .batch import ReadingBatch
 from .client import IOmeterClient
 from .exceptions import (
+    IOmeterCircuitOpenError,
     IOmeterConnectionError,
     IOmeterNoReadingsError,
     IOmeterNoStatusError,
     IOmeterTimeoutError,
 )
+from .fleet import FleetResult, IOmeterFleet
 from .reading import Reading
+from .scheduler import PollResult, PollScheduler, PollTarget
+from .snapshot import Snapshot
 from .status import Status
+from .sync import IOmeterSyncClient
 
 __version__ = "0.1.0"
 
 __all__ = [
     "IOmeterClient",
+    "IOmeterSyncClient",
+    "IOmeterFleet",
+    "FleetResult",
+    "PollScheduler",
+    "PollTarget",
+    "PollResult",
     "IOmeterConnectionError",
+    "IOmeterCircuitOpenError",
     "IOmeterTimeoutError",
     "IOmeterNoReadingsError",
     "IOmeterNoStatusError",
     "Reading",
+    "ReadingBatch",
+    "Snapshot",
     "Status",
 ]
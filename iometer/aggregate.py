@@ -0,0 +1,315 @@
+"""Rolling-window statistics updated with every reading.
+
+A RollingAggregator consumes Reading objects of one or more meters and
+keeps, for several window lengths at once, the minimum, maximum and mean
+of the current power and the energy consumed and produced within the
+window. Every reading updates the windows in amortized constant time:
+minimum and maximum are kept in monotonic deques and the mean as a
+running sum. Querying a window takes constant time however long it is.
+
+Windows end at the time of the latest reading of the meter and cover the
+readings of the preceding window seconds. Readings are kept in at most
+buckets buckets per window, not one by one, so memory does not grow with
+the polling rate: with the defaults, a 24 hour window keeps one-minute
+buckets while the 1 and 15 minute windows stay exact at 1 Hz. A bucket
+leaves the window only once all its readings have, so a window may cover
+up to window / buckets seconds of older readings.
+
+Times are epoch seconds, naive times of readings are taken as UTC as in
+iometer.timestamps.
+
+Energy counters are handled as in iometer.analytics: a decreasing counter
+is taken as a reset, and the new value as the energy counted since.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+from .reading import Reading
+from .timestamps import epoch_micros
+
+# One minute, 15 minutes and 24 hours.
+DEFAULT_WINDOWS = (60.0, 900.0, 86400.0)
+
+# Buckets per window, one minute each for 24 hours.
+DEFAULT_BUCKETS = 1440
+
+
+@dataclass(frozen=True, slots=True)
+class WindowStats:
+    """Statistics of the readings within a window.
+
+    Attributes:
+        window: Length of the window in seconds
+        start: Epoch seconds of the oldest reading in the window
+        end: Epoch seconds of the newest reading in the window
+        count: Number of readings in the window that reported power
+        min_power: Lowest power in W
+        max_power: Highest power in W
+        mean_power: Average power in W over the readings
+        consumption: Energy in Wh consumed between the oldest and the
+            newest reading
+        production: Energy in Wh produced between the oldest and the
+            newest reading
+
+    Values are None if no reading in the window reported them.
+    """
+
+    window: float
+    start: float | None = None
+    end: float | None = None
+    count: int = 0
+    min_power: float | None = None
+    max_power: float | None = None
+    mean_power: float | None = None
+    consumption: float | None = None
+    production: float | None = None
+
+
+@dataclass(slots=True)
+class _EnergyCounter:
+    """Energy counted since the first value, across counter resets."""
+
+    last: float | None = None
+    total: float | None = None
+
+    def update(self, value: float | None) -> float | None:
+        """Add a counter value and get the energy counted so far."""
+        if value is None:
+            return self.total
+        if self.last is None or self.total is None:
+            self.total = 0.0
+        else:
+            self.total += value - self.last if value >= self.last else value
+        self.last = value
+        return self.total
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """Readings of a window that fall into the same time slot."""
+
+    index: int
+    first_time: float
+    first_consumption: float | None
+    first_production: float | None
+    last_time: float
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class RollingWindow:
+    """Power and energy statistics over a sliding time window.
+
+    Attributes:
+        window: Length of the window in seconds
+        buckets: Maximum number of buckets the readings are kept in
+    """
+
+    window: float
+    buckets: int = DEFAULT_BUCKETS
+    _width: float = field(init=False, repr=False)
+    _buckets: deque[_Bucket] = field(default_factory=deque, init=False, repr=False)
+    # Candidates for the minimum and maximum as (bucket index, power), with
+    # power ascending and descending respectively, at most one per bucket.
+    _min: deque[tuple[int, float]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _max: deque[tuple[int, float]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _sum: float = field(default=0.0, init=False, repr=False)
+    _count: int = field(default=0, init=False, repr=False)
+    # Time and cumulative consumption and production of the latest reading.
+    _last: tuple[float, float | None, float | None] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._width = self.window / self.buckets
+
+    def push(
+        self,
+        time: float,
+        power: float | None,
+        consumption: float | None,
+        production: float | None,
+    ) -> None:
+        """Add a reading, times must be increasing.
+
+        Args:
+            time: Epoch seconds of the reading
+            power: Current power in W
+            consumption: Energy consumed in Wh since the first reading
+            production: Energy produced in Wh since the first reading
+        """
+        index = int(time // self._width)
+        buckets = self._buckets
+        if buckets and buckets[-1].index == index:
+            bucket = buckets[-1]
+            bucket.last_time = time
+        else:
+            bucket = _Bucket(index, time, consumption, production, time)
+            buckets.append(bucket)
+        self._last = (time, consumption, production)
+
+        if power is not None:
+            bucket.total += power
+            bucket.count += 1
+            self._sum += power
+            self._count += 1
+            while self._min and self._min[-1][1] >= power:
+                self._min.pop()
+            if not self._min or self._min[-1][0] != index:
+                self._min.append((index, power))
+            while self._max and self._max[-1][1] <= power:
+                self._max.pop()
+            if not self._max or self._max[-1][0] != index:
+                self._max.append((index, power))
+
+        # Drop buckets whose readings all fell out of the window ending now.
+        start = time - self.window
+        while buckets[0].last_time <= start:
+            bucket = buckets.popleft()
+            self._sum -= bucket.total
+            self._count -= bucket.count
+        oldest = buckets[0].index
+        while self._min and self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max and self._max[0][0] < oldest:
+            self._max.popleft()
+        if not self._count:
+            # Do not carry rounding errors into the next readings.
+            self._sum = 0.0
+
+    def stats(self) -> WindowStats:
+        """Get the statistics of the window."""
+        if not self._buckets or self._last is None:
+            return WindowStats(window=self.window)
+        first, last = self._buckets[0], self._last
+        return WindowStats(
+            window=self.window,
+            start=first.first_time,
+            end=last[0],
+            count=self._count,
+            min_power=self._min[0][1] if self._min else None,
+            max_power=self._max[0][1] if self._max else None,
+            mean_power=self._sum / self._count if self._count else None,
+            consumption=_delta(first.first_consumption, last[1]),
+            production=_delta(first.first_production, last[2]),
+        )
+
+
+def _delta(first: float | None, last: float | None) -> float | None:
+    if last is None:
+        return None
+    return last - (first or 0.0)
+
+
+@dataclass
+class MeterAggregator:
+    """Rolling windows of several lengths for the readings of one meter.
+
+    Attributes:
+        windows: Lengths of the windows in seconds
+        buckets: Maximum number of buckets per window, see RollingWindow
+        last_time: Epoch seconds of the latest reading added
+    """
+
+    windows: Sequence[float] = DEFAULT_WINDOWS
+    buckets: int = DEFAULT_BUCKETS
+    last_time: float | None = field(default=None, init=False)
+    _windows: dict[float, RollingWindow] = field(init=False, repr=False)
+    _consumption: _EnergyCounter = field(
+        default_factory=_EnergyCounter, init=False, repr=False
+    )
+    _production: _EnergyCounter = field(
+        default_factory=_EnergyCounter, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._windows = {
+            window: RollingWindow(window, self.buckets) for window in self.windows
+        }
+
+    def add(self, reading: Reading) -> bool:
+        """Add a reading to all windows.
+
+        Readings that are not newer than the latest reading added, e.g.
+        the same reading polled twice, are ignored.
+
+        Returns:
+            Whether the reading was added
+        """
+        time = epoch_micros(reading.meter.reading.time) / 1_000_000
+        if self.last_time is not None and time <= self.last_time:
+            return False
+        self.last_time = time
+
+        power = reading.get_current_power()
+        consumption = self._consumption.update(reading.get_total_consumption())
+        production = self._production.update(reading.get_total_production())
+        for window in self._windows.values():
+            window.push(time, power, consumption, production)
+        return True
+
+    def stats(self, window: float) -> WindowStats:
+        """Get the statistics of a window.
+
+        Raises:
+            KeyError: If no window of this length is kept
+        """
+        return self._windows[window].stats()
+
+    def all_stats(self) -> dict[float, WindowStats]:
+        """Get the statistics of all windows by window length."""
+        return {length: window.stats() for length, window in self._windows.items()}
+
+
+@dataclass
+class RollingAggregator:
+    """Rolling windows for the readings of several meters.
+
+    Attributes:
+        windows: Lengths of the windows in seconds kept for every meter
+        buckets: Maximum number of buckets per window, see RollingWindow
+        meters: Aggregator per meter number
+
+    Example:
+        aggregator = RollingAggregator()
+        async for reading in client.stream_readings(interval=1):
+            aggregator.add(reading)
+            stats = aggregator.stats(reading.meter.number, 900)
+    """
+
+    windows: Sequence[float] = DEFAULT_WINDOWS
+    buckets: int = DEFAULT_BUCKETS
+    meters: dict[str, MeterAggregator] = field(default_factory=dict)
+
+    def add(self, reading: Reading) -> bool:
+        """Add a reading to the windows of its meter.
+
+        Returns:
+            Whether the reading was added, see MeterAggregator.add
+        """
+        meter = self.meters.get(reading.meter.number)
+        if meter is None:
+            meter = MeterAggregator(self.windows, self.buckets)
+            self.meters[reading.meter.number] = meter
+        return meter.add(reading)
+
+    def extend(self, readings: Iterable[Reading]) -> None:
+        """Add several readings."""
+        for reading in readings:
+            self.add(reading)
+
+    def stats(self, meter_number: str, window: float) -> WindowStats:
+        """Get the statistics of a window of a meter.
+
+        Raises:
+            KeyError: If the meter has no readings or no window of this
+                length is kept
+        """
+        return self.meters[meter_number].stats(window)
@@ -0,0 +1,219 @@
+"""Energy analytics on columnar batches of readings.
+
+All functions work on the columns of a ReadingBatch instead of walking
+Reading objects. Times are expected in ascending order. Energy counters are
+treated as monotonic: a decreasing value is taken as a counter reset, and the
+new value as the energy counted since the reset. Intervals longer than
+max_gap seconds are treated as gaps and are not attributed to any period.
+"""
+
+import math
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+from .batch import ReadingBatch
+from .reading import Reading
+
+NAN = math.nan
+
+
+@dataclass
+class LoadProfile:
+    """Energy per fixed-length period, e.g. the 15 minute load profile.
+
+    Attributes:
+        period: Length of each period in seconds
+        starts: Epoch seconds at which each period starts
+        energy: Energy in Wh per period, NaN for periods without data
+    """
+
+    period: int
+    starts: array
+    energy: array
+
+    def power(self) -> array:
+        """Get the average power in W per period."""
+        factor = 3600 / self.period
+        return array("d", (energy * factor for energy in self.energy))
+
+    def peak(self) -> tuple[int, float] | None:
+        """Get the start and average power in W of the period with peak demand.
+
+        Returns None if no period has data.
+        """
+        peak = None
+        for start, energy in zip(self.starts, self.energy):
+            if not math.isnan(energy) and (peak is None or energy > peak[1]):
+                peak = (start, energy)
+        if peak is None:
+            return None
+        return peak[0], peak[1] * 3600 / self.period
+
+
+@dataclass
+class EnergyBalance:
+    """Consumed and produced energy per period.
+
+    Attributes:
+        period: Length of each period in seconds
+        starts: Epoch seconds at which each period starts
+        consumption: Energy drawn from the grid in Wh per period
+        production: Energy fed into the grid in Wh per period
+    """
+
+    period: int
+    starts: array
+    consumption: array
+    production: array
+
+    def net(self) -> array:
+        """Get consumption minus production in Wh per period."""
+        return array(
+            "d",
+            (
+                consumed - produced
+                for consumed, produced in zip(self.consumption, self.production)
+            ),
+        )
+
+    def totals(self) -> tuple[float, float]:
+        """Get total consumption and production in Wh over all periods."""
+        return _nansum(self.consumption), _nansum(self.production)
+
+
+def _nansum(values: Sequence[float]) -> float:
+    """Sum values, ignoring NaN."""
+    return math.fsum(value for value in values if not math.isnan(value))
+
+
+def _intervals(
+    times: Sequence[int], values: Sequence[float], max_gap: float | None
+) -> Iterator[tuple[int, int, int, float]]:
+    """Yield index, start, end and counter delta of consecutive valid values."""
+    previous_time = previous_value = None
+    for index, (time, value) in enumerate(zip(times, values)):
+        if math.isnan(value):
+            continue
+        if previous_value is not None and (
+            max_gap is None or time - previous_time <= max_gap
+        ):
+            delta = value - previous_value
+            # A decreasing counter was reset, it counted up from zero since.
+            yield index, previous_time, time, value if delta < 0 else delta
+        previous_time, previous_value = time, value
+
+
+def interval_deltas(
+    times: Sequence[int], values: Sequence[float], max_gap: float | None = None
+) -> array:
+    """Get the counter increase since the previous valid value.
+
+    Args:
+        times: Epoch seconds of each value
+        values: Energy counter values, NaN where missing
+        max_gap: Maximum number of seconds between two values
+    Returns:
+        Delta per value, NaN for the first value, missing values and gaps
+    """
+    deltas = array("d", [NAN]) * len(values)
+    for index, _start, _end, delta in _intervals(times, values, max_gap):
+        deltas[index] = delta
+    return deltas
+
+
+def _bucket(
+    times: Sequence[int], values: Sequence[float], period: int, max_gap: float | None
+) -> tuple[array, array]:
+    """Distribute counter deltas over fixed-length periods.
+
+    Each delta is split across the periods its interval overlaps in
+    proportion to the overlap.
+    """
+    if not times:
+        return array("q"), array("d")
+
+    first = times[0] // period
+    count = times[-1] // period - first + 1
+    starts = array("q", ((first + index) * period for index in range(count)))
+    energy = array("d", [NAN]) * count
+
+    for _index, start, end, delta in _intervals(times, values, max_gap):
+        bucket = (start if start < end else end) // period
+        if end <= (bucket + 1) * period:
+            # Common case, the interval lies within a single period.
+            slices = ((bucket, delta),)
+        else:
+            slices = []
+            position = start
+            while position < end:
+                bucket = position // period
+                stop = min(end, (bucket + 1) * period)
+                slices.append((bucket, delta * (stop - position) / (end - start)))
+                position = stop
+        for bucket, share in slices:
+            bucket -= first
+            if math.isnan(energy[bucket]):
+                energy[bucket] = share
+            else:
+                energy[bucket] += share
+
+    return starts, energy
+
+
+def load_profile(
+    batch: ReadingBatch,
+    period: int = 900,
+    obis: str = Reading.TOTAL_CONSUMPTION_OBIS,
+    max_gap: float | None = None,
+) -> LoadProfile:
+    """Get the energy per period of an energy counter.
+
+    Args:
+        batch: Readings of a single meter
+        period: Length of each period in seconds, 15 minutes by default
+        obis: OBIS code of the energy counter, total consumption by default
+        max_gap: Maximum number of seconds between two readings
+    Returns:
+        The load profile covering all readings of the batch
+    """
+    starts, energy = _bucket(batch.times, batch.column(obis), period, max_gap)
+    return LoadProfile(period=period, starts=starts, energy=energy)
+
+
+def peak_demand(
+    batch: ReadingBatch, period: int = 900, max_gap: float | None = None
+) -> tuple[int, float] | None:
+    """Get the highest average consumption power over any period.
+
+    Args:
+        batch: Readings of a single meter
+        period: Length of each period in seconds, 15 minutes by default
+        max_gap: Maximum number of seconds between two readings
+    Returns:
+        Start of the period and its average power in W, None without data
+    """
+    return load_profile(batch, period, max_gap=max_gap).peak()
+
+
+def energy_balance(
+    batch: ReadingBatch, period: int = 900, max_gap: float | None = None
+) -> EnergyBalance:
+    """Get consumed and produced energy per period.
+
+    Args:
+        batch: Readings of a single meter
+        period: Length of each period in seconds, 15 minutes by default
+        max_gap: Maximum number of seconds between two readings
+    Returns:
+        The consumption and production per period
+    """
+    starts, consumption = _bucket(
+        batch.times, batch.total_consumption(), period, max_gap
+    )
+    _starts, production = _bucket(
+        batch.times, batch.total_production(), period, max_gap
+    )
+    return EnergyBalance(
+        period=period, starts=starts, consumption=consumption, production=production
+    )
@@ -0,0 +1,272 @@
+"""Archives of readings and statuses as newline delimited JSON (NDJSON).
+
+Every line of an archive is one payload as returned by the bridge or by
+to_json. Archives can be compressed with gzip or, with the zstandard package
+installed, with zstd. By default the compression is chosen by the file
+suffix: ".gz" for gzip and ".zst" for zstd.
+
+Reading streams the file line by line, through mmap for uncompressed files,
+and decodes the lines in batches with a single JSON call each. Filters on
+time and meter number are checked on the raw line first, so lines that do
+not match are never decoded.
+"""
+
+import gzip
+import io
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from . import codec
+from .batch import ReadingBatch
+from .reading import Reading
+from .status import Status
+from .timestamps import parse_timestamp
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+PathLike = str | os.PathLike[str]
+
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+_TIME = re.compile(rb'"time"\s*:\s*"([^"]*)"')
+_NUMBER = re.compile(rb'"number"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def _compression(path: PathLike, compression: str | None) -> str | None:
+    """Resolve the compression of an archive."""
+    if compression == "auto":
+        return _SUFFIXES.get(Path(path).suffix.lower())
+    if compression not in (None, "gzip", "zstd"):
+        raise ValueError(f"Unknown compression {compression!r}")
+    return compression
+
+
+def open_archive(
+    path: PathLike, mode: str = "rb", compression: str | None = "auto"
+) -> IO[bytes]:
+    """Open an archive file for binary reading or writing.
+
+    Args:
+        path: Path of the archive
+        mode: One of "rb", "wb" or "ab"
+        compression: "gzip", "zstd", None for no compression or "auto" to
+            choose by the file suffix
+    Returns:
+        A binary file object
+    Raises:
+        ValueError: If the compression is unknown or not installed
+    """
+    kind = _compression(path, compression)
+    if kind == "gzip":
+        return gzip.open(path, mode, compresslevel=6)
+    if kind == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        file = zstandard.open(path, mode)
+        # The zstd reader cannot iterate lines by itself.
+        return io.BufferedReader(file) if "r" in mode else file
+    return open(path, mode)  # pylint: disable=consider-using-with
+
+
+def write_ndjson(
+    path: PathLike,
+    items: Iterable[Reading | Status | str | bytes],
+    compression: str | None = "auto",
+    append: bool = False,
+) -> int:
+    """Write readings, statuses or raw payloads to an archive.
+
+    Args:
+        path: Path of the archive
+        items: Reading or Status objects, or raw JSON payloads
+        compression: See open_archive
+        append: Append to an existing archive instead of replacing it
+    Returns:
+        The number of lines written
+    Raises:
+        ValueError: If a raw payload spans several lines
+    """
+    count = 0
+    with open_archive(path, "ab" if append else "wb", compression) as file:
+        for item in items:
+            if isinstance(item, (Reading, Status)):
+                line = item.to_json().encode()
+            else:
+                line = item.encode() if isinstance(item, str) else bytes(item)
+                # Bodies of the bridge may end with a line break.
+                line = line.rstrip(b"\r\n")
+                if b"\n" in line:
+                    raise ValueError("Payloads must not contain line breaks")
+            file.write(line + b"\n")
+            count += 1
+    return count
+
+
+def iter_lines(path: PathLike, compression: str | None = "auto") -> Iterator[bytes]:
+    """Iterate over the non-empty lines of an archive.
+
+    Uncompressed archives are memory mapped instead of read into memory.
+
+    Args:
+        path: Path of the archive
+        compression: See open_archive
+    Returns:
+        The lines without line breaks
+    """
+    if _compression(path, compression) is None:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for line in iter(mapped.readline, b""):
+                    if line := line.rstrip(b"\r\n"):
+                        yield line
+        return
+
+    with open_archive(path, "rb", compression) as file:
+        for line in file:
+            if line := line.rstrip(b"\r\n"):
+                yield line
+
+
+def _filter_lines(
+    lines: Iterable[bytes],
+    start: datetime | None,
+    end: datetime | None,
+    meter_number: str | None,
+) -> Iterator[bytes]:
+    """Skip lines outside the time range or of other meters, undecoded."""
+    if start is None and end is None and meter_number is None:
+        yield from lines
+        return
+
+    number = None if meter_number is None else json.dumps(meter_number).encode()
+    for line in lines:
+        if number is not None:
+            match = _NUMBER.search(line)
+            if match is None:
+                continue
+            value = match.group(1)
+            # Escaped numbers may be written differently by other encoders.
+            if value != number and (
+                b"\\" not in value or json.loads(value) != meter_number
+            ):
+                continue
+        if start is not None or end is not None:
+            match = _TIME.search(line)
+            if match is None:
+                continue
+            time = parse_timestamp(match.group(1).decode())
+            if (start is not None and time < start) or (
+                end is not None and time >= end
+            ):
+                continue
+        yield line
+
+
+def _decode_batches(lines: Iterable[bytes], batch_size: int) -> Iterator[list[Any]]:
+    """Decode lines with one JSON call per batch."""
+    batch: list[bytes] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield codec.loads(b"[" + b",".join(batch) + b"]")
+            batch = []
+    if batch:
+        yield codec.loads(b"[" + b",".join(batch) + b"]")
+
+
+def read_readings(
+    path: PathLike,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    meter_number: str | None = None,
+    lazy: bool = False,
+    batch_size: int = 1000,
+    compression: str | None = "auto",
+) -> Iterator[Reading]:
+    """Stream the readings of an archive.
+
+    Args:
+        path: Path of the archive
+        start: Skip readings before this time, timezone aware
+        end: Skip readings at or after this time, timezone aware
+        meter_number: Skip readings of other meters
+        lazy: Create lazy readings, see Reading.from_json
+        batch_size: Number of lines decoded at once
+        compression: See open_archive
+    Returns:
+        The readings in the order of the archive
+    """
+    lines = _filter_lines(iter_lines(path, compression), start, end, meter_number)
+    for batch in _decode_batches(lines, batch_size):
+        for data in batch:
+            yield Reading.from_dict(data, lazy=lazy)
+
+
+def read_reading_batch(
+    path: PathLike,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    meter_number: str | None = None,
+    batch: ReadingBatch | None = None,
+    batch_size: int = 1000,
+    compression: str | None = "auto",
+) -> ReadingBatch:
+    """Load the readings of an archive into a ReadingBatch.
+
+    The payloads are decoded straight into the columns without creating
+    Reading objects. Filters are the same as for read_readings.
+
+    Args:
+        path: Path of the archive
+        start: Skip readings before this time, timezone aware
+        end: Skip readings at or after this time, timezone aware
+        meter_number: Skip readings of other meters
+        batch: Append to this batch instead of a new one
+        batch_size: Number of lines decoded at once
+        compression: See open_archive
+    Returns:
+        The batch holding the readings
+    """
+    if batch is None:
+        batch = ReadingBatch()
+    lines = _filter_lines(iter_lines(path, compression), start, end, meter_number)
+    for decoded in _decode_batches(lines, batch_size):
+        for data in decoded:
+            batch.append_dict(data)
+    return batch
+
+
+def read_statuses(
+    path: PathLike,
+    *,
+    meter_number: str | None = None,
+    batch_size: int = 1000,
+    compression: str | None = "auto",
+) -> Iterator[Status]:
+    """Stream the statuses of an archive.
+
+    Args:
+        path: Path of the archive
+        meter_number: Skip statuses of other meters
+        batch_size: Number of lines decoded at once
+        compression: See open_archive
+    Returns:
+        The statuses in the order of the archive
+    """
+    lines = _filter_lines(iter_lines(path, compression), None, None, meter_number)
+    for batch in _decode_batches(lines, batch_size):
+        for data in batch:
+            yield Status.from_dict(data)
@@ -0,0 +1,197 @@
+"""Columnar storage for time series of IOmeter readings."""
+
+import math
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from . import codec
+from .obis import get_obis, intern_unit
+from .reading import Meter, MeterReading, Reading, Register
+from .timestamps import epoch_micros, parse_timestamp
+
+NAN = math.nan
+
+
+@dataclass
+class ReadingBatch:
+    """Time series of readings stored column by column.
+
+    Times are kept as int64 epoch seconds and every OBIS code as a
+    contiguous float64 column with one entry per reading. Registers missing
+    from a reading are stored as NaN. The columns are array.array objects
+    and support the buffer protocol, so they can be wrapped without copying,
+    e.g. with numpy.frombuffer(batch.column(obis)).
+
+    Times are stored in whole seconds, like the bridge sends them, so
+    fractions of a second are dropped. Naive times are taken as UTC, as in
+    iometer.binary, and readings of the batch have UTC times.
+
+    Attributes:
+        times: Epoch seconds of each reading
+        numbers: Meter number of each reading
+        columns: Register values by OBIS code
+        units: Unit of each OBIS code, as seen in its first reading
+
+    Example:
+        batch = ReadingBatch.from_readings(readings)
+        power = batch.current_power()
+        reading = batch[-1]
+    """
+
+    times: array = field(default_factory=lambda: array("q"))
+    numbers: list[str] = field(default_factory=list)
+    columns: dict[str, array] = field(default_factory=dict)
+    units: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[Reading]) -> "ReadingBatch":
+        """Create a batch from Reading objects."""
+        batch = cls()
+        batch.extend(readings)
+        return batch
+
+    @classmethod
+    def from_json(cls, payloads: Iterable[codec.Payload]) -> "ReadingBatch":
+        """Create a batch from raw reading payloads.
+
+        The payloads are decoded straight into the columns without creating
+        Reading or Register objects.
+        """
+        batch = cls()
+        for payload in payloads:
+            batch.append_json(payload)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index: int) -> Reading:
+        """Materialize a single reading of the batch."""
+        index = range(len(self.times))[index]
+        registers = [
+            Register(obis=obis, value=column[index], unit=self.units[obis])
+            for obis, column in self.columns.items()
+            if not math.isnan(column[index])
+        ]
+        meter_reading = MeterReading(
+            time=datetime.fromtimestamp(self.times[index], timezone.utc),
+            registers=registers,
+        )
+        return Reading(meter=Meter(number=self.numbers[index], reading=meter_reading))
+
+    def to_readings(self) -> list[Reading]:
+        """Materialize all readings of the batch."""
+        return [self[index] for index in range(len(self))]
+
+    def append(self, reading: Reading) -> None:
+        """Append a Reading to the batch."""
+        self.append_row(
+            reading.meter.number,
+            reading.meter.reading.time,
+            (
+                (register.obis, register.value, register.unit)
+                for register in reading.meter.reading.registers
+            ),
+        )
+
+    def extend(self, readings: Iterable[Reading]) -> None:
+        """Append several Readings to the batch."""
+        for reading in readings:
+            self.append(reading)
+
+    def append_json(self, payload: codec.Payload) -> None:
+        """Append a raw reading payload to the batch."""
+        self.append_dict(codec.loads(payload))
+
+    def append_dict(self, payload: dict[str, Any]) -> None:
+        """Append a decoded reading payload to the batch."""
+        data = payload["meter"]
+        self.append_row(
+            data["number"],
+            parse_timestamp(data["reading"]["time"]),
+            (
+                (register["obis"], register["value"], register["unit"])
+                for register in data["reading"]["registers"]
+            ),
+        )
+
+    def append_row(
+        self,
+        number: str,
+        time: datetime,
+        registers: Iterable[tuple[str, float, str]],
+    ) -> None:
+        """Append a reading given as its parts.
+
+        Args:
+            number: Meter number
+            time: Time of the reading, naive times are taken as UTC
+            registers: (obis, value, unit) tuples of the registers
+        """
+        row = len(self.times)
+        self.times.append(epoch_micros(time) // 1_000_000)
+        self.numbers.append(number)
+
+        for obis, value, unit in registers:
+            column = self.columns.get(obis)
+            if column is None:
+                # Backfill readings that did not report this register.
+                obis = get_obis(obis)
+                column = self.columns[obis] = array("d", [NAN]) * row
+                self.units[obis] = intern_unit(unit)
+            elif len(column) > row:
+                # Keep the first register for duplicate OBIS codes.
+                continue
+            column.append(value)
+
+        for column in self.columns.values():
+            if len(column) == row:
+                column.append(NAN)
+
+    def column(self, obis: str) -> array:
+        """Get the values of an OBIS code, NaN where it was not reported."""
+        column = self.columns.get(obis)
+        if column is None:
+            return array("d", [NAN]) * len(self.times)
+        return column
+
+    def total_consumption(self) -> array:
+        """Get total consumption in Wh per reading."""
+        return self.column(Reading.TOTAL_CONSUMPTION_OBIS)
+
+    def total_production(self) -> array:
+        """Get total production in Wh per reading."""
+        return self.column(Reading.TOTAL_PRODUCTION_OBIS)
+
+    def consumption_tariff_T1(self) -> array:  # pylint: disable=invalid-name
+        """Get consumption for tariff T1 in Wh per reading."""
+        return self.column(Reading.CONSUMPTION_TARIFF_T1_OBIS)
+
+    def consumption_tariff_T2(self) -> array:  # pylint: disable=invalid-name
+        """Get consumption for tariff T2 in Wh per reading."""
+        return self.column(Reading.CONSUMPTION_TARIFF_T2_OBIS)
+
+    def current_power(self) -> array:
+        """Get current power in W per reading.
+
+        Like Reading.get_current_power, 10.07.00 is preferred and 24.07.00 is
+        used for readings that lack it.
+        """
+        power = self.columns.get(Reading.CURRENT_POWER_OBIS)
+        power_alt = self.columns.get(Reading.CURRENT_POWER_OBIS_ALT)
+        if power is None or power_alt is None:
+            return self.column(
+                Reading.CURRENT_POWER_OBIS_ALT
+                if power is None
+                else Reading.CURRENT_POWER_OBIS
+            )
+        return array(
+            "d",
+            (
+                alt if math.isnan(value) else value
+                for value, alt in zip(power, power_alt)
+            ),
+        )
@@ -0,0 +1,322 @@
+"""Compact binary encoding of readings.
+
+A reading is encoded as a frame. OBIS codes, units and meter numbers are
+interned: each distinct string is sent once and referred to by its index
+afterwards. Timestamps are int64 microseconds since the epoch and register
+values packed float64.
+
+ReadingEncoder and ReadingDecoder keep the string table across frames, so
+a stream of readings sends every string only once. With delta encoding,
+a frame of a meter seen before stores the time difference to its previous
+reading, and, if the registers are the same, the XOR of the float64 bits
+with the previous values as varints. Unchanged values take a single byte.
+Delta encoded frames must be decoded in order by one decoder.
+
+Frame layout, integers are unsigned LEB128 varints unless noted:
+
+    flags (1 byte): 1 = delta to the previous reading of the meter,
+        2 = same registers as the previous reading of the meter
+    count of new strings, each as length and UTF-8 bytes
+    index of the meter number
+    time: int64 little endian, or zigzag time difference with delta
+    unless same registers: count of registers, each as OBIS and unit index
+    values: float64 little endian, or XOR varints with delta and same
+        registers
+"""
+
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from .obis import get_obis, intern_unit
+from .reading import Meter, MeterReading, Reading, Register
+from .timestamps import epoch_micros, from_epoch_micros
+
+MAGIC = b"IOMB"
+VERSION = 1
+
+# Kinds of encoded data following the header.
+_SINGLE = 0
+_STREAM = 1
+
+_DELTA = 1
+_SAME_REGISTERS = 2
+
+_INT64 = struct.Struct("<q")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: memoryview, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+@dataclass(slots=True)
+class _MeterState:
+    """Previous reading of a meter, as needed for delta encoding."""
+
+    time: int
+    layout: tuple[int, ...]
+    bits: tuple[int, ...]
+
+
+@dataclass
+class ReadingEncoder:
+    """Encode readings into frames sharing one string table.
+
+    Attributes:
+        delta: Encode readings relative to the previous reading of the meter
+    """
+
+    delta: bool = True
+    _strings: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _meters: dict[str, _MeterState] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def encode(self, reading: Reading) -> bytes:
+        """Encode a reading as a frame.
+
+        Raises:
+            TypeError: If a register value is not a number
+        """
+        meter = reading.meter
+        registers = meter.reading.registers
+        count = len(registers)
+        # Pack first, so that an invalid value leaves the state untouched.
+        try:
+            packed = struct.pack(
+                f"<{count}d", *(register.value for register in registers)
+            )
+        except struct.error as err:
+            raise TypeError("Register values must be numbers") from err
+        time = epoch_micros(meter.reading.time)
+
+        new: list[str] = []
+        number = self._intern(meter.number, new)
+        layout = tuple(
+            index
+            for register in registers
+            for index in (
+                self._intern(register.obis, new),
+                self._intern(register.unit, new),
+            )
+        )
+
+        previous = self._meters.get(meter.number) if self.delta else None
+        flags = 0
+        if previous is not None:
+            flags |= _DELTA
+            if previous.layout == layout:
+                flags |= _SAME_REGISTERS
+
+        out = bytearray((flags,))
+        _write_varint(out, len(new))
+        for value in new:
+            encoded = value.encode()
+            _write_varint(out, len(encoded))
+            out += encoded
+        _write_varint(out, number)
+
+        if previous is None:
+            out += _INT64.pack(time)
+        else:
+            _write_varint(out, _zigzag(time - previous.time))
+
+        if not flags & _SAME_REGISTERS:
+            _write_varint(out, count)
+            for index in layout:
+                _write_varint(out, index)
+
+        bits: tuple[int, ...] = ()
+        if self.delta:
+            bits = struct.unpack(f"<{count}Q", packed)
+            self._meters[meter.number] = _MeterState(time, layout, bits)
+        if previous is not None and flags & _SAME_REGISTERS:
+            for value, before in zip(bits, previous.bits):
+                _write_varint(out, value ^ before)
+        else:
+            out += packed
+        return bytes(out)
+
+    def _intern(self, value: str, new: list[str]) -> int:
+        """Get the index of a string, adding it to the table if needed."""
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+            new.append(value)
+        return index
+
+
+@dataclass
+class ReadingDecoder:
+    """Decode frames created by a ReadingEncoder, in order."""
+
+    _strings: list[str] = field(default_factory=list, init=False, repr=False)
+    _meters: dict[str, _MeterState] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def decode(self, frame: bytes | memoryview) -> Reading:
+        """Decode a frame into a reading.
+
+        Raises:
+            ValueError: If the frame is truncated or does not continue the
+                frames decoded before
+        """
+        try:
+            return self._decode(memoryview(frame))
+        except (IndexError, KeyError, struct.error) as err:
+            raise ValueError("Invalid or out of order reading frame") from err
+
+    def _decode(self, data: memoryview) -> Reading:
+        strings = self._strings
+        flags = data[0]
+        new, pos = _read_varint(data, 1)
+        for _ in range(new):
+            length, pos = _read_varint(data, pos)
+            strings.append(str(data[pos : pos + length], "utf-8"))
+            pos += length
+        index, pos = _read_varint(data, pos)
+        number = strings[index]
+
+        previous = self._meters[number] if flags & _DELTA else None
+        if previous is None:
+            (time,) = _INT64.unpack_from(data, pos)
+            pos += 8
+        else:
+            difference, pos = _read_varint(data, pos)
+            time = previous.time + _unzigzag(difference)
+
+        if previous is not None and flags & _SAME_REGISTERS:
+            layout = previous.layout
+            changed = []
+            for before in previous.bits:
+                xor, pos = _read_varint(data, pos)
+                changed.append(before ^ xor)
+            bits = tuple(changed)
+            count = len(bits)
+            values = struct.unpack(f"<{count}d", struct.pack(f"<{count}Q", *bits))
+        else:
+            count, pos = _read_varint(data, pos)
+            chunk = data[pos : pos + 2 * count]
+            if len(chunk) == 2 * count and max(chunk, default=0) < 0x80:
+                # Tables of up to 128 strings use one byte per index.
+                layout = tuple(chunk)
+                pos += 2 * count
+            else:
+                indices = []
+                for _ in range(2 * count):
+                    index, pos = _read_varint(data, pos)
+                    indices.append(index)
+                layout = tuple(indices)
+            values = struct.unpack_from(f"<{count}d", data, pos)
+            pos += 8 * count
+            bits = struct.unpack(f"<{count}Q", struct.pack(f"<{count}d", *values))
+        if pos != len(data):
+            raise ValueError("Unexpected data after reading frame")
+
+        self._meters[number] = _MeterState(time, layout, bits)
+        registers = [
+            Register(
+                obis=get_obis(strings[obis]),
+                value=value,
+                unit=intern_unit(strings[unit]),
+            )
+            for obis, unit, value in zip(layout[::2], layout[1::2], values)
+        ]
+        meter_reading = MeterReading(time=from_epoch_micros(time), registers=registers)
+        return Reading(meter=Meter(number=number, reading=meter_reading))
+
+
+def dumps_reading(reading: Reading) -> bytes:
+    """Encode a single reading, see Reading.to_bytes."""
+    return (
+        MAGIC + bytes((VERSION, _SINGLE)) + ReadingEncoder(delta=False).encode(reading)
+    )
+
+
+def loads_reading(data: bytes | memoryview) -> Reading:
+    """Decode a single reading, see Reading.from_bytes.
+
+    Raises:
+        ValueError: If data is not an encoded reading
+    """
+    view = _check_header(data, _SINGLE)
+    return ReadingDecoder().decode(view[6:])
+
+
+def dumps_readings(readings: Iterable[Reading], delta: bool = True) -> bytes:
+    """Encode a sequence of readings with a shared string table.
+
+    Args:
+        readings: The readings to encode
+        delta: Encode readings relative to the previous reading of the meter
+    Returns:
+        The encoded readings
+    """
+    encoder = ReadingEncoder(delta=delta)
+    out = bytearray(MAGIC + bytes((VERSION, _STREAM)))
+    for reading in readings:
+        frame = encoder.encode(reading)
+        _write_varint(out, len(frame))
+        out += frame
+    return bytes(out)
+
+
+def loads_readings(data: bytes | memoryview) -> list[Reading]:
+    """Decode readings encoded with dumps_readings.
+
+    Raises:
+        ValueError: If data is not a sequence of encoded readings
+    """
+    view = _check_header(data, _STREAM)
+    decoder = ReadingDecoder()
+    readings = []
+    pos = 6
+    try:
+        while pos < len(view):
+            length, pos = _read_varint(view, pos)
+            if pos + length > len(view):
+                raise ValueError("Truncated reading frame")
+            readings.append(decoder.decode(view[pos : pos + length]))
+            pos += length
+    except IndexError as err:
+        raise ValueError("Truncated reading frame") from err
+    return readings
+
+
+def _check_header(data: bytes | memoryview, kind: int) -> memoryview:
+    """Check magic, version and kind of encoded data."""
+    view = memoryview(data)
+    if len(view) < 6 or view[:4] != MAGIC:
+        raise ValueError("Data is not an encoded IOmeter reading")
+    if view[4] != VERSION:
+        raise ValueError(f"Unsupported encoding version {view[4]}")
+    if view[5] != kind:
+        raise ValueError(
+            "Data holds a sequence of readings"
+            if view[5] == _STREAM
+            else "Data holds a single reading"
+        )
+    return view
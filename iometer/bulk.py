@@ -0,0 +1,217 @@
+"""Decode large backlogs of bridge payloads on several processes.
+
+The payloads are split into chunks that are decoded by a process pool. To
+keep the cost of sending results back low, workers return plain tuples
+instead of Reading or Status objects, with OBIS codes and units interned
+so each distinct string is pickled once per chunk. Results keep the order
+of the payloads.
+
+Creating Reading objects from the rows still happens in the calling
+process. For the largest backlogs decode_reading_rows or
+decode_reading_batch avoid that serial step.
+
+With the spawn or forkserver start method, functions of this module must be
+called under an ``if __name__ == "__main__":`` guard.
+"""
+
+import sys
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain
+from typing import Any, TypeVar
+
+from . import codec
+from .batch import ReadingBatch
+from .obis import get_obis, intern_unit
+from .reading import Meter, MeterReading, Reading, Register
+from .status import Bridge, Core, Device, NullMeter, Status
+from .status import Meter as StatusMeter
+from .timestamps import parse_timestamp
+
+T = TypeVar("T")
+
+# Meter number, timestamp and registers as (obis, value, unit) tuples.
+ReadingRow = tuple[str, str, tuple[tuple[str, float, str], ...]]
+
+# Bridge rssi and version, device id, the fields of Core in order and the
+# meter number, None if the status has no meter.
+StatusRow = tuple[Any, ...]
+
+
+def _reading_rows(payloads: Sequence[str | bytes]) -> list[ReadingRow]:
+    """Decode reading payloads into rows, runs in the worker processes."""
+    intern = sys.intern
+    rows = []
+    for payload in payloads:
+        meter = codec.loads(payload)["meter"]
+        reading = meter["reading"]
+        registers = tuple(
+            (intern(register["obis"]), register["value"], intern(register["unit"]))
+            for register in reading["registers"]
+        )
+        rows.append((meter["number"], reading["time"], registers))
+    return rows
+
+
+def _status_rows(payloads: Sequence[str | bytes]) -> list[StatusRow]:
+    """Decode status payloads into rows, runs in the worker processes."""
+    rows = []
+    for payload in payloads:
+        data = codec.loads(payload)
+        bridge = data["device"]["bridge"]
+        core = data["device"]["core"]
+        rows.append(
+            (
+                bridge["rssi"],
+                bridge["version"],
+                data["device"]["id"],
+                core["connectionStatus"],
+                core.get("rssi"),
+                core.get("version"),
+                core.get("powerStatus"),
+                core.get("attachmentStatus"),
+                core.get("pinStatus"),
+                core.get("batteryLevel"),
+                data["meter"]["number"] if data.get("meter") else None,
+            )
+        )
+    return rows
+
+
+def _reading_from_row(row: ReadingRow) -> Reading:
+    number, time, registers = row
+    meter_reading = MeterReading(
+        time=parse_timestamp(time),
+        registers=[
+            Register(get_obis(obis), value, intern_unit(unit))
+            for obis, value, unit in registers
+        ],
+    )
+    return Reading(meter=Meter(number=number, reading=meter_reading))
+
+
+def _status_from_row(row: StatusRow) -> Status:
+    device = Device(
+        bridge=Bridge(rssi=row[0], version=row[1]),
+        id=row[2],
+        core=Core(*row[3:10]),
+    )
+    meter = StatusMeter(number=row[10]) if row[10] is not None else NullMeter()
+    return Status(meter=meter, device=device)
+
+
+def _decode(
+    decode: Callable[[Sequence[str | bytes]], list[T]],
+    payloads: Sequence[str | bytes],
+    chunk_size: int,
+    max_workers: int | None,
+    executor: Executor | None,
+) -> Iterator[T]:
+    """Decode payloads in chunks on a process pool, keeping their order."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    chunks = [
+        payloads[start : start + chunk_size]
+        for start in range(0, len(payloads), chunk_size)
+    ]
+    if executor is not None:
+        return chain.from_iterable(executor.map(decode, chunks))
+    if len(chunks) <= 1 or max_workers == 1:
+        # A pool costs more than it saves for a single chunk.
+        return chain.from_iterable(map(decode, chunks))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return chain.from_iterable(list(pool.map(decode, chunks)))
+
+
+def decode_reading_rows(
+    payloads: Sequence[str | bytes],
+    *,
+    chunk_size: int = 5000,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[ReadingRow]:
+    """Decode reading payloads into tuples on a process pool.
+
+    Args:
+        payloads: Raw v1/reading payloads
+        chunk_size: Number of payloads sent to a worker at once
+        max_workers: Number of worker processes, defaults to the CPU count
+        executor: Existing executor to use instead of a new process pool
+    Returns:
+        One (meter number, timestamp, registers) tuple per payload, the
+        registers as (obis, value, unit) tuples
+    """
+    return list(_decode(_reading_rows, payloads, chunk_size, max_workers, executor))
+
+
+def decode_readings(
+    payloads: Sequence[str | bytes],
+    *,
+    chunk_size: int = 5000,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[Reading]:
+    """Decode reading payloads on a process pool.
+
+    Equivalent to calling Reading.from_json on every payload. The JSON is
+    decoded by the workers, the Reading objects are created from the
+    returned tuples.
+
+    Args:
+        payloads: Raw v1/reading payloads
+        chunk_size: Number of payloads sent to a worker at once
+        max_workers: Number of worker processes, defaults to the CPU count
+        executor: Existing executor to use instead of a new process pool
+    Returns:
+        The readings in the order of the payloads
+    """
+    rows = _decode(_reading_rows, payloads, chunk_size, max_workers, executor)
+    return [_reading_from_row(row) for row in rows]
+
+
+def decode_reading_batch(
+    payloads: Sequence[str | bytes],
+    *,
+    chunk_size: int = 5000,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> ReadingBatch:
+    """Decode reading payloads on a process pool into a ReadingBatch.
+
+    Args:
+        payloads: Raw v1/reading payloads
+        chunk_size: Number of payloads sent to a worker at once
+        max_workers: Number of worker processes, defaults to the CPU count
+        executor: Existing executor to use instead of a new process pool
+    Returns:
+        A batch holding the readings in the order of the payloads
+    """
+    batch = ReadingBatch()
+    for number, time, registers in _decode(
+        _reading_rows, payloads, chunk_size, max_workers, executor
+    ):
+        batch.append_row(number, parse_timestamp(time), registers)
+    return batch
+
+
+def decode_statuses(
+    payloads: Sequence[str | bytes],
+    *,
+    chunk_size: int = 5000,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[Status]:
+    """Decode status payloads on a process pool.
+
+    Equivalent to calling Status.from_json on every payload.
+
+    Args:
+        payloads: Raw v1/status payloads
+        chunk_size: Number of payloads sent to a worker at once
+        max_workers: Number of worker processes, defaults to the CPU count
+        executor: Existing executor to use instead of a new process pool
+    Returns:
+        The statuses in the order of the payloads
+    """
+    rows = _decode(_status_rows, payloads, chunk_size, max_workers, executor)
+    return [_status_from_row(row) for row in rows]
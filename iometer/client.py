@@ -1,10 +1,21 @@
 """Asynchronous Python client for IOmeter."""
 
 import asyncio
-from dataclasses import dataclass
-from typing import Optional, Self
+import contextlib
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional, Self, TypeVar
 
-from aiohttp import ClientResponseError, ClientSession
+from aiohttp import (
+    ClientResponseError,
+    ClientSession,
+    DummyCookieJar,
+    TCPConnector,
+    TraceConfig,
+)
 from yarl import URL
 
 from .exceptions import (
@@ -13,9 +24,54 @@ from .exceptions import (
     IOmeterNoStatusError,
     IOmeterTimeoutError,
 )
+from .metrics import MetricsSink, RequestMetrics, create_trace_config
 from .reading import Reading
+from .resilience import AdaptiveTimeout, CircuitBreaker
+from .snapshot import Snapshot
 from .status import Status
 
+T = TypeVar("T")
+
+HEADERS = {
+    "User-Agent": "PythonIOmeter/0.1",
+    "Accept": "application/json",
+}
+
+
+def create_session(
+    *,
+    limit: int = 100,
+    limit_per_host: int = 2,
+    keepalive_timeout: float = 30.0,
+    ttl_dns_cache: int | None = 300,
+    trace_configs: Sequence[TraceConfig] | None = None,
+) -> ClientSession:
+    """Create a ClientSession tuned for polling IOmeter bridges.
+
+    Connections are kept alive between polls, DNS lookups are cached and the
+    cookie jar is disabled since the bridge does not use cookies.
+
+    Args:
+        limit: Maximum number of simultaneous connections
+        limit_per_host: Maximum number of simultaneous connections per bridge
+        keepalive_timeout: Seconds an idle connection is kept open for reuse
+        ttl_dns_cache: Seconds DNS lookups are cached, None caches forever
+        trace_configs: Optional aiohttp TraceConfigs for the session
+    Returns:
+        The configured session
+    """
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+    )
+    return ClientSession(
+        connector=connector,
+        cookie_jar=DummyCookieJar(),
+        trace_configs=list(trace_configs) if trace_configs else None,
+    )
+
 
 @dataclass
 class IOmeterClient:
@@ -25,6 +81,26 @@ class IOmeterClient:
         host: The hostname or IP address of the IOmeter bridge
         request_timeout: Number of seconds to wait for bridge response
         session: Optional aiohttp ClientSession for making requests
+        keepalive_timeout: Seconds an idle connection is kept open for reuse
+        limit_per_host: Maximum number of simultaneous connections to the bridge
+        ttl_dns_cache: Seconds DNS lookups are cached, None caches forever
+        port: Optional TCP port of the bridge, defaults to 80
+        deduplicate: Return the previous Reading object without parsing if
+            the bridge answers with an identical body
+        lazy_readings: Parse the timestamp and registers of readings only
+            when they are accessed, see LazyMeterReading
+        metrics: Optional callable receiving a RequestMetrics per request
+        adaptive_timeout: Optional AdaptiveTimeout deriving the timeout from
+            the observed latency, request_timeout remains the upper limit
+        circuit_breaker: Optional CircuitBreaker failing fast with
+            IOmeterCircuitOpenError after repeated failures
+        coalesce: Let concurrent calls for the same endpoint share a single
+            request to the bridge
+        reading_cache_ttl: Seconds a reading is served from cache, 0 disables
+        status_cache_ttl: Seconds a status is served from cache, 0 disables
+
+    The connection settings only apply to the session created by the client,
+    not to a session passed in by the caller.
 
     Example:
         async with IOmeterClient("192.168.1.100") as client:
@@ -35,32 +111,126 @@ class IOmeterClient:
     host: str
     request_timeout: int = 60
     session: Optional[ClientSession] = None
+    keepalive_timeout: float = 30.0
+    limit_per_host: int = 2
+    ttl_dns_cache: int | None = 300
+    port: Optional[int] = None
+    deduplicate: bool = False
+    lazy_readings: bool = False
+    metrics: Optional[MetricsSink] = None
+    adaptive_timeout: Optional[AdaptiveTimeout] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+    coalesce: bool = False
+    reading_cache_ttl: float = 0.0
+    status_cache_ttl: float = 0.0
+    _inflight: dict[str, asyncio.Future] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _cache: dict[str, tuple[float, Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _last_reading: tuple[str, Reading] | None = field(
+        default=None, init=False, repr=False
+    )
+    _urls: dict[str, URL] = field(default_factory=dict, init=False, repr=False)
+
+    def _url(self, uri: str) -> URL:
+        """Get the URL of an endpoint, built once per client.
+
+        Args:
+            uri: The URI endpoint to request
+        Returns:
+            The absolute URL of the endpoint
+        """
+        url = self._urls.get(uri)
+        if url is None:
+            url = URL.build(scheme="http", host=self.host, port=self.port).joinpath(uri)
+            self._urls[uri] = url
+        return url
 
-    async def _request(self, uri: str) -> str:
+    async def _request(self, uri: str, metrics: RequestMetrics | None = None) -> bytes:
         """Make a request to the IOmeter bridge.
 
         Args:
             uri: The URI endpoint to request
+            metrics: Optional RequestMetrics to record timings of the request
         Returns:
-            The response text from the bridge
+            The undecoded response body from the bridge
 
         Raises:
             IOmeterConnectionError: If any communication error occurs
+            IOmeterCircuitOpenError: If the circuit breaker is open
         """
         if not self.session:
             raise RuntimeError("Client session not initialized")
 
-        url = URL.build(scheme="http", host=self.host).joinpath(uri)
-        headers = {
-            "User-Agent": "PythonIOmeter/0.1",
-            "Accept": "application/json",
-        }
+        breaker = self.circuit_breaker
+        adaptive = self.adaptive_timeout
+        if breaker is None and adaptive is None:
+            return await self._send(uri, self.request_timeout, metrics)
+
+        if breaker is not None:
+            breaker.before_request()
+        timeout = self.request_timeout
+        if adaptive is not None:
+            timeout = min(timeout, adaptive.timeout)
 
+        start = time.perf_counter()
         try:
-            async with asyncio.timeout(self.request_timeout):
-                response = await self.session.get(url, headers=headers)
+            response = await self._send(uri, timeout, metrics)
+        except (IOmeterNoReadingsError, IOmeterNoStatusError):
+            # The bridge answered, it just has no data yet.
+            if breaker is not None:
+                breaker.record_success()
+            raise
+        except IOmeterTimeoutError:
+            if adaptive is not None:
+                adaptive.record_timeout()
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except IOmeterConnectionError:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        if adaptive is not None:
+            adaptive.observe(time.perf_counter() - start)
+        if breaker is not None:
+            breaker.record_success()
+        return response
+
+    async def _send(
+        self, uri: str, timeout: float, metrics: RequestMetrics | None
+    ) -> bytes:
+        """Send a request and map errors to IOmeter exceptions.
+
+        Args:
+            uri: The URI endpoint to request
+            timeout: Number of seconds to wait for the response
+            metrics: Optional RequestMetrics to record timings of the request
+        Returns:
+            The undecoded response body from the bridge
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                if metrics is None:
+                    response = await self.session.get(self._url(uri), headers=HEADERS)
+                    response.raise_for_status()
+                    return await response.read()
+
+                start = time.perf_counter()
+                response = await self.session.get(
+                    self._url(uri), headers=HEADERS, trace_request_ctx=metrics
+                )
+                metrics.ttfb = time.perf_counter() - start
+                metrics.status = response.status
                 response.raise_for_status()
-                return await response.text()
+                start = time.perf_counter()
+                body = await response.read()
+                metrics.read = time.perf_counter() - start
+                metrics.size = len(body)
+                return body
 
         except asyncio.TimeoutError as error:
             raise IOmeterTimeoutError(
@@ -90,17 +260,121 @@ class IOmeterClient:
                 f"Error communicating with IOmeter bridge: {str(error)}"
             ) from error
 
+    async def _get(self, uri: str, parse: Callable[[bytes], T]) -> T:
+        """Request an endpoint and parse the response.
+
+        Args:
+            uri: The URI endpoint to request
+            parse: Function creating the result from the response body
+        Returns:
+            The parsed response
+        """
+        if self.metrics is None:
+            return parse(await self._request(uri))
+
+        metrics = RequestMetrics(host=self.host, endpoint=uri)
+        start = time.perf_counter()
+        try:
+            response = await self._request(uri, metrics)
+            parse_start = time.perf_counter()
+            result = parse(response)
+            metrics.parse = time.perf_counter() - parse_start
+        except BaseException as error:
+            metrics.error = type(error).__name__
+            self._record(metrics, start)
+            raise
+        self._record(metrics, start)
+        return result
+
+    def _record(self, metrics: RequestMetrics, start: float) -> None:
+        """Pass the metrics of a finished request to the metrics sink."""
+        if self.metrics is None:
+            return
+        metrics.total = time.perf_counter() - start
+        # A failing sink must not replace the result or error of the request.
+        with contextlib.suppress(Exception):
+            self.metrics(metrics)
+
+    async def _fetch(
+        self,
+        uri: str,
+        parse: Callable[[bytes], T],
+        ttl: float,
+        key: str | None = None,
+    ) -> T:
+        """Get an endpoint through the cache and in-flight request sharing.
+
+        Args:
+            uri: The URI endpoint to request
+            parse: Function creating the result from the response body
+            ttl: Seconds a cached result stays valid, 0 disables the cache
+            key: Key of the result in the cache and among in-flight
+                requests, defaults to uri
+        Returns:
+            The parsed response
+        """
+        if key is None:
+            key = uri
+        if ttl > 0:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+
+        if not self.coalesce:
+            result = await self._get(uri, parse)
+        else:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = asyncio.ensure_future(self._get(uri, parse))
+                self._inflight[key] = inflight
+                inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shield the shared request so one cancelled caller does not
+            # cancel it for the others.
+            result = await asyncio.shield(inflight)
+
+        if ttl > 0:
+            self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def invalidate_cache(self, endpoint: str | None = None) -> None:
+        """Drop cached results so the next call requests the bridge.
+
+        Args:
+            endpoint: Either "reading" or "status", None drops both
+        """
+        if endpoint is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(f"v1/{endpoint}", None)
+            self._cache.pop(f"v1/{endpoint}:raw", None)
+
+    def _parse_reading(self, response: bytes) -> Reading:
+        """Parse a reading, reusing the previous one if deduplicate is enabled."""
+        if not self.deduplicate:
+            return Reading.from_json(response, lazy=self.lazy_readings)
+
+        if self._last_reading and self._last_reading[0] == response:
+            return self._last_reading[1]
+        reading = Reading.from_json(response, lazy=self.lazy_readings)
+        self._last_reading = (response, reading)
+        return reading
+
     async def get_current_reading(self) -> Reading:
         """Get current reading from IOmeter bridge.
 
+        If deduplicate is enabled and the bridge has not updated its reading
+        since the last call, the same Reading object is returned again, so
+        callers can detect unchanged readings with an identity check.
+
         Returns:
             Reading object containing the current meter values
 
         Raises:
             IOmeterConnectionError: If communication with bridge fails
         """
-        response = await self._request("v1/reading")
-        return Reading.from_json(response)
+        return await self._fetch(
+            "v1/reading", self._parse_reading, self.reading_cache_ttl
+        )
 
     async def get_current_status(self) -> Status:
         """Get device status from IOmeter bridge.
@@ -111,8 +385,132 @@ class IOmeterClient:
         Raises:
             IOmeterConnectionError: If communication with bridge fails
         """
-        response = await self._request("v1/status")
-        return Status.from_json(response)
+        return await self._fetch("v1/status", Status.from_json, self.status_cache_ttl)
+
+    async def get_current_reading_raw(self) -> bytes:
+        """Get the current reading from IOmeter bridge as undecoded JSON.
+
+        The body is returned as received, e.g. to write it to an archive or
+        to pass it to Reading.from_json later. Caching and coalescing apply
+        as for get_current_reading.
+
+        Returns:
+            The JSON body of the v1/reading response
+
+        Raises:
+            IOmeterConnectionError: If communication with bridge fails
+        """
+        return await self._fetch(
+            "v1/reading", bytes, self.reading_cache_ttl, key="v1/reading:raw"
+        )
+
+    async def get_current_status_raw(self) -> bytes:
+        """Get the device status from IOmeter bridge as undecoded JSON.
+
+        Returns:
+            The JSON body of the v1/status response
+
+        Raises:
+            IOmeterConnectionError: If communication with bridge fails
+        """
+        return await self._fetch(
+            "v1/status", bytes, self.status_cache_ttl, key="v1/status:raw"
+        )
+
+    async def get_snapshot(self) -> Snapshot:
+        """Get reading and status from IOmeter bridge concurrently.
+
+        A missing reading or status does not fail the snapshot, the
+        respective attribute is None instead.
+
+        Returns:
+            Snapshot with the reading, the status and their latencies
+
+        Raises:
+            IOmeterConnectionError: If communication with bridge fails
+        """
+
+        async def timed(fetch: Callable[[], Awaitable[T]]) -> tuple[T | None, float]:
+            start = time.perf_counter()
+            try:
+                result: T | None = await fetch()
+            except (IOmeterNoReadingsError, IOmeterNoStatusError):
+                result = None
+            return result, time.perf_counter() - start
+
+        fetched_at = datetime.now(timezone.utc)
+        results = await asyncio.gather(
+            timed(self.get_current_reading),
+            timed(self.get_current_status),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        (reading, reading_latency), (status, status_latency) = results
+        return Snapshot(
+            fetched_at=fetched_at,
+            reading=reading,
+            status=status,
+            reading_latency=reading_latency,
+            status_latency=status_latency,
+        )
+
+    async def stream_readings(
+        self,
+        interval: float = 1.0,
+        max_backoff: float = 60.0,
+        changes_only: bool = False,
+    ) -> AsyncIterator[Reading]:
+        """Continuously poll readings at a fixed rate.
+
+        Polls are scheduled against the event loop's monotonic clock, so the
+        period does not drift by the request latency. Ticks that were missed
+        because a request or the consumer was too slow are skipped instead
+        of being run back to back. Connection errors and timeouts are retried
+        with exponential backoff up to max_backoff seconds.
+
+        Args:
+            interval: Seconds between two polls
+            max_backoff: Maximum number of seconds to wait after an error
+            changes_only: Only yield readings that differ from the previous
+                one, this requires deduplicate to be enabled
+        Yields:
+            Reading objects, one per successful poll
+
+        Raises:
+            IOmeterNoReadingsError: If the bridge has no readings available
+
+        Example:
+            async for reading in client.stream_readings(interval=1.0):
+                print(reading.get_current_power())
+        """
+        if changes_only and not self.deduplicate:
+            raise ValueError("changes_only requires deduplicate to be enabled")
+
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        backoff = 0.0
+        previous: Reading | None = None
+
+        while True:
+            try:
+                reading = await self.get_current_reading()
+            except (IOmeterConnectionError, IOmeterTimeoutError):
+                backoff = min(max_backoff, backoff * 2 or interval)
+                next_tick = loop.time() + backoff
+            else:
+                backoff = 0.0
+                if reading is not previous or not changes_only:
+                    yield reading
+                previous = reading
+                next_tick += interval
+                now = loop.time()
+                if next_tick < now:
+                    # Skip the ticks missed while the bridge or consumer was slow.
+                    next_tick += math.ceil((now - next_tick) / interval) * interval
+
+            await asyncio.sleep(next_tick - loop.time())
 
     async def close(self) -> None:
         """Close the client session."""
@@ -126,7 +524,12 @@ class IOmeterClient:
         Returns:
             The configured client instance
         """
-        self.session = self.session or ClientSession()
+        self.session = self.session or create_session(
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            trace_configs=[create_trace_config()] if self.metrics else None,
+        )
         return self
 
     async def __aexit__(self, *_exc_info: object) -> None:
@@ -0,0 +1,78 @@
+"""JSON codec used to decode and encode IOmeter payloads.
+
+Decoding uses orjson or msgspec when one of them is installed and falls back
+to the standard library otherwise. All backends decode to the same Python
+objects. Payloads may be given as str, bytes, bytearray or memoryview.
+Encoding always uses the standard library so that the output of
+to_json stays byte for byte identical, whichever backend is active.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+Payload = str | bytes | bytearray | memoryview
+
+
+def _json_loads(payload: Payload) -> Any:
+    """Decode with the standard library, which does not accept memoryview."""
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    return json.loads(payload)
+
+
+_DECODERS: dict[str, Callable[[Payload], Any]] = {"json": _json_loads}
+if msgspec is not None:
+    _DECODERS["msgspec"] = msgspec.json.Decoder().decode
+if orjson is not None:
+    _DECODERS["orjson"] = orjson.loads
+
+# Order of preference when no backend is selected explicitly.
+_PREFERENCE = ("orjson", "msgspec", "json")
+
+backend: str = next(name for name in _PREFERENCE if name in _DECODERS)
+loads: Callable[[Payload], Any] = _DECODERS[backend]
+
+
+def available_backends() -> list[str]:
+    """Get the names of the installed JSON backends, fastest first."""
+    return [name for name in _PREFERENCE if name in _DECODERS]
+
+
+def set_backend(name: str | None = None) -> str:
+    """Select the JSON backend used for decoding.
+
+    Args:
+        name: One of "orjson", "msgspec" or "json", None selects the
+            fastest installed backend
+    Returns:
+        The name of the selected backend
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global backend, loads  # pylint: disable=global-statement
+
+    if name is None:
+        name = available_backends()[0]
+    if name not in _DECODERS:
+        raise ValueError(f"JSON backend {name!r} is not available")
+
+    backend = name
+    loads = _DECODERS[name]
+    return name
+
+
+def dumps(obj: Any) -> str:
+    """Encode obj as a JSON string."""
+    return json.dumps(obj)
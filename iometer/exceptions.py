@@ -9,6 +9,10 @@ class IOmeterConnectionError(IOmeterError):
     """IOmeter connection exception."""
 
 
+class IOmeterCircuitOpenError(IOmeterConnectionError):
+    """IOmeter bridge skipped after repeated failures exception."""
+
+
 class IOmeterTimeoutError(IOmeterError):
     """IOmeter client and bridge timeout exception."""
 
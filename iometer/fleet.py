@@ -0,0 +1,177 @@
+"""Concurrent polling of many IOmeter bridges over one connection pool."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Generic, Optional, Self, TypeVar
+
+from aiohttp import ClientSession
+
+from .client import IOmeterClient, create_session
+from .metrics import MetricsSink, create_trace_config
+from .reading import Reading
+from .resilience import AdaptiveTimeout, CircuitBreaker
+from .status import Status
+
+T = TypeVar("T")
+
+
+@dataclass
+class FleetResult(Generic[T]):
+    """Outcome of polling a single bridge of the fleet.
+
+    Exactly one of value and error is set. The error is usually an
+    IOmeterError, but may be any exception raised for this bridge, e.g.
+    when its response could not be parsed.
+    """
+
+    host: str
+    value: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the bridge answered successfully."""
+        return self.error is None
+
+
+@dataclass
+class IOmeterFleet:
+    """Poll many IOmeter bridges concurrently through one shared session.
+
+    All bridges share a single aiohttp ClientSession backed by one
+    TCPConnector, so keep-alive connections are pooled per host and reused
+    across polling cycles. Results are yielded as soon as each bridge has
+    answered, so a slow bridge does not hold up the rest of the sweep.
+
+    Attributes:
+        hosts: Hostnames or IP addresses of the IOmeter bridges
+        max_concurrency: Maximum number of requests in flight at once
+        request_timeout: Number of seconds to wait for each bridge response
+        limit_per_host: Maximum number of pooled connections per bridge
+        keepalive_timeout: Seconds an idle connection is kept open for reuse
+        ttl_dns_cache: Seconds DNS lookups are cached, None caches forever
+        session: Optional aiohttp ClientSession shared by all clients
+        metrics: Optional callable receiving a RequestMetrics per request
+        adaptive_timeout: Optional factory of an AdaptiveTimeout per bridge
+        circuit_breaker: Optional factory of a CircuitBreaker per bridge, so
+            dead bridges fail fast and free up concurrency for healthy ones
+
+    Example:
+        async with IOmeterFleet(["192.168.1.100", "192.168.1.101"]) as fleet:
+            async for result in fleet.poll_readings():
+                if result.ok:
+                    print(result.host, result.value.get_current_power())
+    """
+
+    hosts: list[str]
+    max_concurrency: int = 50
+    request_timeout: int = 60
+    limit_per_host: int = 2
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: int | None = 300
+    session: Optional[ClientSession] = None
+    metrics: Optional[MetricsSink] = None
+    adaptive_timeout: Optional[Callable[[], AdaptiveTimeout]] = None
+    circuit_breaker: Optional[Callable[[], CircuitBreaker]] = None
+    clients: dict[str, IOmeterClient] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _close_session: bool = field(default=False, init=False, repr=False)
+
+    def poll_readings(self) -> AsyncIterator[FleetResult[Reading]]:
+        """Get the current reading of every bridge.
+
+        Yields:
+            A FleetResult per bridge, in order of completion
+        """
+        return self._poll(lambda client: client.get_current_reading())
+
+    def poll_status(self) -> AsyncIterator[FleetResult[Status]]:
+        """Get the current status of every bridge.
+
+        Yields:
+            A FleetResult per bridge, in order of completion
+        """
+        return self._poll(lambda client: client.get_current_status())
+
+    async def _poll(
+        self, fetch: Callable[[IOmeterClient], Awaitable[T]]
+    ) -> AsyncIterator[FleetResult[T]]:
+        """Run fetch against all clients with bounded concurrency.
+
+        Args:
+            fetch: Coroutine function requesting data from a single client
+        Yields:
+            A FleetResult per bridge, in order of completion
+        """
+        if self.session is None:
+            raise RuntimeError("Fleet session not initialized")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(host: str, client: IOmeterClient) -> FleetResult[T]:
+            async with semaphore:
+                try:
+                    return FleetResult(host=host, value=await fetch(client))
+                # A failure of one bridge must not end the sweep of the others.
+                except Exception as error:  # pylint: disable=broad-except
+                    return FleetResult(host=host, error=error)
+
+        tasks = [
+            asyncio.create_task(run(host, client))
+            for host, client in self.clients.items()
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding requests if the consumer leaves the loop early.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Close the shared session if it is owned by the fleet."""
+        if self.session and self._close_session:
+            await self.session.close()
+        self.session = None
+        self._close_session = False
+        self.clients = {}
+
+    async def __aenter__(self) -> Self:
+        """Set up the shared session and one client per bridge.
+
+        Returns:
+            The configured fleet instance
+        """
+        if not self.session:
+            self.session = create_session(
+                limit=self.max_concurrency,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+                trace_configs=[create_trace_config()] if self.metrics else None,
+            )
+            self._close_session = True
+
+        self.clients = {
+            host: IOmeterClient(
+                host,
+                request_timeout=self.request_timeout,
+                session=self.session,
+                metrics=self.metrics,
+                adaptive_timeout=(
+                    self.adaptive_timeout() if self.adaptive_timeout else None
+                ),
+                circuit_breaker=(
+                    self.circuit_breaker() if self.circuit_breaker else None
+                ),
+            )
+            for host in dict.fromkeys(self.hosts)
+        }
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Clean up the shared session."""
+        await self.close()
@@ -0,0 +1,230 @@
+"""Per-request metrics of the IOmeter client.
+
+When a client is given a metrics sink, it records a RequestMetrics object for
+every request and passes it to the sink. A sink is any callable accepting a
+RequestMetrics, e.g. a plain function, a MetricsRingBuffer or a
+MetricsRegistry.
+
+DNS and connect timings are collected through an aiohttp TraceConfig, which
+is installed on sessions created by the client. With a session passed in by
+the caller, add create_trace_config() to its trace_configs to get them.
+"""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    """Timings and outcome of a single request to a bridge.
+
+    All durations are in seconds and None if the phase did not happen, e.g.
+    dns and connect are None when a pooled connection was reused.
+
+    Attributes:
+        host: The bridge the request was sent to
+        endpoint: The requested URI, e.g. "v1/reading"
+        dns: Duration of the DNS lookup
+        connect: Duration of establishing the connection
+        connection_reused: Whether a pooled keep-alive connection was used
+        ttfb: Time until the response headers were received
+        read: Duration of reading the response body
+        parse: Duration of parsing the body into a Reading or Status
+        total: Duration of the whole call
+        size: Size of the response body in bytes
+        status: HTTP status code of the response
+        error: Name of the exception raised by the call, if any
+    """
+
+    host: str
+    endpoint: str
+    dns: float | None = None
+    connect: float | None = None
+    connection_reused: bool | None = None
+    ttfb: float | None = None
+    read: float | None = None
+    parse: float | None = None
+    total: float | None = None
+    size: int | None = None
+    status: int | None = None
+    error: str | None = None
+
+
+MetricsSink = Callable[[RequestMetrics], None]
+
+
+def create_trace_config() -> TraceConfig:
+    """Create a TraceConfig recording DNS and connect timings.
+
+    Timings are written to the RequestMetrics object passed to the request
+    as trace_request_ctx, requests without one are ignored.
+    """
+
+    def metrics_of(context: SimpleNamespace) -> RequestMetrics | None:
+        metrics = context.trace_request_ctx
+        return metrics if isinstance(metrics, RequestMetrics) else None
+
+    async def on_dns_start(_session: ClientSession, context: Any, _params: Any) -> None:
+        context.dns_start = time.perf_counter()
+
+    async def on_dns_end(_session: ClientSession, context: Any, _params: Any) -> None:
+        if (metrics := metrics_of(context)) is not None:
+            metrics.dns = time.perf_counter() - context.dns_start
+
+    async def on_connect_start(
+        _session: ClientSession, context: Any, _params: Any
+    ) -> None:
+        context.connect_start = time.perf_counter()
+
+    async def on_connect_end(
+        _session: ClientSession, context: Any, _params: Any
+    ) -> None:
+        if (metrics := metrics_of(context)) is not None:
+            metrics.connect = time.perf_counter() - context.connect_start
+            metrics.connection_reused = False
+
+    async def on_connection_reused(
+        _session: ClientSession, context: Any, _params: Any
+    ) -> None:
+        if (metrics := metrics_of(context)) is not None:
+            metrics.connection_reused = True
+
+    trace_config = TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connect_start)
+    trace_config.on_connection_create_end.append(on_connect_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reused)
+    return trace_config
+
+
+@dataclass
+class MetricsRingBuffer:
+    """Sink keeping the most recent request metrics in memory.
+
+    Attributes:
+        maxlen: Number of requests to keep
+    """
+
+    maxlen: int = 1000
+    entries: deque[RequestMetrics] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.entries = deque(maxlen=self.maxlen)
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        self.entries.append(metrics)
+
+    def snapshot(self) -> list[RequestMetrics]:
+        """Get the buffered metrics, oldest first."""
+        return list(self.entries)
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Phases of RequestMetrics that are recorded as histograms.
+PHASES = ("dns", "connect", "ttfb", "read", "parse", "total")
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram of observed values, as used by Prometheus.
+
+    Attributes:
+        buckets: Upper bounds of the buckets, in ascending order
+        counts: Number of observations per bucket, plus one for +Inf
+        total: Sum of all observations
+    """
+
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+    counts: list[int] = field(init=False)
+    total: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    @property
+    def count(self) -> int:
+        """Get the number of observations."""
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.total += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+
+@dataclass
+class MetricsRegistry:
+    """Sink aggregating request metrics into counters and histograms.
+
+    Counters and histograms are labeled by host and endpoint. render()
+    returns them in the Prometheus text exposition format.
+
+    Attributes:
+        buckets: Upper bounds of the latency histogram buckets in seconds
+    """
+
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+    requests: dict[tuple[str, str, str], int] = field(default_factory=dict)
+    response_bytes: dict[tuple[str, str], int] = field(default_factory=dict)
+    durations: dict[tuple[str, str, str], Histogram] = field(default_factory=dict)
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        labels = (metrics.host, metrics.endpoint)
+        key = (*labels, metrics.error or "ok")
+        self.requests[key] = self.requests.get(key, 0) + 1
+        if metrics.size is not None:
+            self.response_bytes[labels] = (
+                self.response_bytes.get(labels, 0) + metrics.size
+            )
+        for phase in PHASES:
+            value = getattr(metrics, phase)
+            if value is None:
+                continue
+            histogram = self.durations.get((*labels, phase))
+            if histogram is None:
+                histogram = self.durations[(*labels, phase)] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def render(self) -> str:
+        """Get all metrics in the Prometheus text exposition format."""
+        lines = ["# TYPE iometer_requests_total counter"]
+        for (host, endpoint, outcome), value in self.requests.items():
+            lines.append(
+                f'iometer_requests_total{{host="{host}",endpoint="{endpoint}",'
+                f'outcome="{outcome}"}} {value}'
+            )
+
+        lines.append("# TYPE iometer_response_bytes_total counter")
+        for (host, endpoint), value in self.response_bytes.items():
+            lines.append(
+                f'iometer_response_bytes_total{{host="{host}",endpoint="{endpoint}"}} '
+                f"{value}"
+            )
+
+        name = "iometer_request_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for (host, endpoint, phase), histogram in self.durations.items():
+            labels = f'host="{host}",endpoint="{endpoint}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, math.inf), histogram.counts):
+                cumulative += count
+                bound_label = "+Inf" if math.isinf(bound) else repr(bound)
+                lines.append(
+                    f'{name}_bucket{{{labels},le="{bound_label}"}} {cumulative}'
+                )
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
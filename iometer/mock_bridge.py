@@ -0,0 +1,259 @@
+"""Local fake IOmeter bridge for load testing and benchmarks.
+
+FakeBridge serves the v1/reading and v1/status endpoints over real HTTP on
+localhost, with configurable latency, jitter and error rates, so that the
+client can be measured including the network stack.
+"""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional, Self
+
+from aiohttp import web
+
+from .client import IOmeterClient, create_session
+from .exceptions import IOmeterError
+from .timestamps import format_timestamp
+
+STATUS_PAYLOAD = json.dumps(
+    {
+        "__typename": "iometer.status.v1",
+        "meter": {"number": "1ISK0000000000"},
+        "device": {
+            "bridge": {"rssi": -30, "version": "build-65"},
+            "id": "658c2b34-2017-45f2-a12b-731235f8bb97",
+            "core": {
+                "connectionStatus": "connected",
+                "rssi": -30,
+                "version": "build-58",
+                "powerStatus": "battery",
+                "batteryLevel": 100,
+                "attachmentStatus": "attached",
+                "pinStatus": "entered",
+            },
+        },
+    }
+)
+
+
+@dataclass
+class FakeBridge:
+    """HTTP server imitating an IOmeter bridge.
+
+    Attributes:
+        latency: Seconds each response is delayed
+        jitter: Maximum number of seconds added to or removed from latency
+        error_rate: Share of requests answered with HTTP 500
+        not_found_rate: Share of requests answered with HTTP 404
+        register_count: Number of registers in each reading, at least 3
+        host: Address the server listens on
+        port: Port the server listens on, 0 picks a free port
+        seed: Optional seed for reproducible latency and errors
+
+    Example:
+        async with FakeBridge(latency=0.01) as bridge:
+            async with bridge.client() as client:
+                reading = await client.get_current_reading()
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    not_found_rate: float = 0.0
+    register_count: int = 3
+    host: str = "127.0.0.1"
+    port: int = 0
+    seed: Optional[int] = None
+    requests: int = field(default=0, init=False)
+    _random: random.Random = field(init=False, repr=False)
+    _runner: Optional[web.AppRunner] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+
+    def client(self, **kwargs: Any) -> IOmeterClient:
+        """Create a client for this bridge.
+
+        Args:
+            kwargs: Further keyword arguments for IOmeterClient
+        Returns:
+            A client that is not yet connected
+        """
+        return IOmeterClient(self.host, port=self.port, **kwargs)
+
+    def reading_payload(self) -> str:
+        """Create a reading with counters that increase over time."""
+        now = time.time()
+        registers = [
+            {"obis": "01-00:01.08.00*ff", "value": round(now / 10, 1), "unit": "Wh"},
+            {"obis": "01-00:02.08.00*ff", "value": round(now / 30, 1), "unit": "Wh"},
+            {"obis": "01-00:10.07.00*ff", "value": 360, "unit": "W"},
+        ]
+        # Further registers imitate phase voltages and currents.
+        registers += [
+            {
+                "obis": f"01-00:{32 + index % 40:02d}.07.{index // 40:02d}*ff",
+                "value": 230.0,
+                "unit": "V",
+            }
+            for index in range(self.register_count - len(registers))
+        ]
+        return json.dumps(
+            {
+                "__typename": "iometer.reading.v1",
+                "meter": {
+                    "number": "1ISK0000000000",
+                    "reading": {
+                        "time": format_timestamp(
+                            datetime.fromtimestamp(now, timezone.utc)
+                        ),
+                        "registers": registers,
+                    },
+                },
+            }
+        )
+
+    async def _respond(self, payload: str) -> web.Response:
+        """Delay and possibly fail a response as configured."""
+        self.requests += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < self.error_rate:
+            return web.Response(status=500)
+        if roll < self.error_rate + self.not_found_rate:
+            return web.Response(status=404)
+        return web.Response(text=payload, content_type="application/json")
+
+    async def _handle_reading(self, _request: web.Request) -> web.Response:
+        return await self._respond(self.reading_payload())
+
+    async def _handle_status(self, _request: web.Request) -> web.Response:
+        return await self._respond(STATUS_PAYLOAD)
+
+    async def start(self) -> None:
+        """Start serving, port is updated to the port actually used."""
+        app = web.Application()
+        app.router.add_get("/v1/reading", self._handle_reading)
+        app.router.add_get("/v1/status", self._handle_status)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await self.stop()
+
+
+@dataclass
+class BenchmarkResult:
+    """Latencies and throughput of a benchmark run.
+
+    Attributes:
+        latencies: Sorted latencies in seconds of all successful requests
+        errors: Number of failed requests
+        elapsed: Wall time of the run in seconds
+    """
+
+    latencies: list[float]
+    errors: int
+    elapsed: float
+
+    @property
+    def requests(self) -> int:
+        """Get the total number of requests."""
+        return len(self.latencies) + self.errors
+
+    @property
+    def requests_per_second(self) -> float:
+        """Get the throughput of the run."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Get a latency percentile in seconds, using the nearest rank."""
+        if not self.latencies:
+            return 0.0
+        rank = max(1, round(percent / 100 * len(self.latencies)))
+        return self.latencies[min(rank, len(self.latencies)) - 1]
+
+    @property
+    def p50(self) -> float:
+        """Get the median latency in seconds."""
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        """Get the 99th percentile latency in seconds."""
+        return self.percentile(99)
+
+
+async def run_benchmark(
+    bridges: int = 10,
+    requests_per_bridge: int = 100,
+    endpoint: str = "reading",
+    **bridge_options: Any,
+) -> BenchmarkResult:
+    """Poll several fake bridges concurrently and measure the client.
+
+    Each bridge is polled sequentially by its own client, all clients share
+    one session and run concurrently.
+
+    Args:
+        bridges: Number of fake bridges to start
+        requests_per_bridge: Number of requests sent to each bridge
+        endpoint: Either "reading" or "status"
+        bridge_options: Keyword arguments for FakeBridge
+    Returns:
+        The measured latencies and throughput
+    """
+    fake_bridges = [FakeBridge(**bridge_options) for _ in range(bridges)]
+    latencies: list[float] = []
+    errors = 0
+
+    async def poll(client: IOmeterClient) -> None:
+        nonlocal errors
+        fetch = (
+            client.get_current_reading
+            if endpoint == "reading"
+            else client.get_current_status
+        )
+        for _ in range(requests_per_bridge):
+            start = time.perf_counter()
+            try:
+                await fetch()
+            except IOmeterError:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    for bridge in fake_bridges:
+        await bridge.start()
+    session = create_session(limit=bridges)
+    try:
+        clients = [bridge.client(session=session) for bridge in fake_bridges]
+        start = time.perf_counter()
+        await asyncio.gather(*(poll(client) for client in clients))
+        elapsed = time.perf_counter() - start
+    finally:
+        await session.close()
+        for bridge in fake_bridges:
+            await bridge.stop()
+
+    return BenchmarkResult(latencies=sorted(latencies), errors=errors, elapsed=elapsed)
@@ -0,0 +1,67 @@
+"""Interned OBIS codes and units.
+
+Readings hold only a handful of distinct OBIS codes and units. get_obis and
+intern_unit return one shared object per distinct value, so registers of
+many readings do not each keep their own copy of the same strings, and two
+interned codes are equal exactly when they are the same object.
+"""
+
+import re
+from typing import Any
+
+# The bridge writes OBIS codes as A-B:C.D.E*F with two hex digits per group.
+_PATTERN = re.compile(
+    r"([0-9a-fA-F]{1,2})-([0-9a-fA-F]{1,2}):([0-9a-fA-F]{1,2})"
+    r"\.([0-9a-fA-F]{1,2})\.([0-9a-fA-F]{1,2})(?:\*([0-9a-fA-F]{1,2}))?"
+)
+
+
+class Obis(str):
+    """OBIS code with its value groups parsed.
+
+    Obis is a str and compares and hashes like the plain code. Use get_obis
+    to get the shared instance of a code instead of creating new ones.
+    Groups of codes that cannot be parsed are None.
+
+    Attributes:
+        medium: Group A, e.g. 1 for electricity
+        channel: Group B
+        indices: Groups C, D, E and F, e.g. (16, 7, 0, 255) for the current
+            power "01-00:10.07.00*ff", F is 255 if the code has none
+    """
+
+    medium: int | None
+    channel: int | None
+    indices: tuple[int, int, int, int] | None
+
+    def __new__(cls, value: str) -> "Obis":
+        obis = super().__new__(cls, value)
+        match = _PATTERN.fullmatch(value)
+        if match is None:
+            obis.medium = obis.channel = obis.indices = None
+            return obis
+        groups = [int(group, 16) for group in match.groups(default="ff")]
+        obis.medium, obis.channel = groups[0], groups[1]
+        obis.indices = (groups[2], groups[3], groups[4], groups[5])
+        return obis
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unpickled and copied codes are interned as well.
+        return (get_obis, (str(self),))
+
+
+_OBIS: dict[str, Obis] = {}
+_UNITS: dict[str, str] = {}
+
+
+def get_obis(value: str) -> Obis:
+    """Get the shared Obis instance of an OBIS code."""
+    obis = _OBIS.get(value)
+    if obis is None:
+        obis = _OBIS.setdefault(str(value), Obis(value))
+    return obis
+
+
+def intern_unit(value: str) -> str:
+    """Get the shared instance of a unit."""
+    return _UNITS.setdefault(value, value)
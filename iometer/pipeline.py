@@ -0,0 +1,367 @@
+"""Batched writing of readings and statuses to files, sockets or callbacks.
+
+A WriterPipeline collects Reading and Status objects in a bounded queue and
+hands them to its sinks in batches, once max_batch_size items are queued or
+flush_interval seconds after the first item of a batch. When the queue is
+full, put() waits until the sinks have caught up, so a slow sink slows down
+the producers instead of the queue growing without bound.
+
+A sink is any object with async write(items) and close() methods, see Sink.
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import IO, Any, Optional, Protocol, Self
+
+from .archive import PathLike, open_archive
+from .reading import Reading
+from .status import Status
+from .timestamps import epoch_micros
+
+Item = Reading | Status
+
+# Put into the queue by close() to stop the writer after the queued items.
+_STOP: Any = object()
+
+
+class Sink(Protocol):
+    """Destination of the batches of a WriterPipeline."""
+
+    async def write(self, items: list[Item]) -> None:
+        """Write a batch, the list is shared by all sinks of the pipeline."""
+
+    async def close(self) -> None:
+        """Release the resources of the sink."""
+
+
+@dataclass
+class NDJSONSink:
+    """Sink appending items as JSON lines to an archive file.
+
+    Each batch is written with a single write and flushed. File access runs
+    in a worker thread so that it does not block the event loop.
+
+    Attributes:
+        path: Path of the archive, see iometer.archive
+        compression: See iometer.archive.open_archive
+    """
+
+    path: PathLike
+    compression: str | None = "auto"
+    _file: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+
+    async def write(self, items: list[Item]) -> None:
+        data = b"".join(item.to_json().encode() + b"\n" for item in items)
+        await asyncio.to_thread(self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        if self._file is None:
+            self._file = open_archive(self.path, "ab", self.compression)
+        self._file.write(data)
+        self._file.flush()
+
+    async def close(self) -> None:
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+
+def _escape(value: str, special: str) -> str:
+    for character in "\\" + special:
+        value = value.replace(character, "\\" + character)
+    return value
+
+
+def to_line_protocol(item: Item, measurement: str = "iometer") -> str | None:
+    """Format a reading or status in the InfluxDB line protocol.
+
+    Readings are written to measurement with the meter number as tag and
+    their power and energy as fields, statuses to measurement + "_status".
+
+    Args:
+        item: The reading or status to format
+        measurement: Name of the measurement
+    Returns:
+        One line without line break, None if item has no values to write
+    """
+    if isinstance(item, Reading):
+        tags = {"meter": item.meter.number}
+        # Register values are floats, even where the bridge sends integers,
+        # as a field must keep its type across all lines.
+        fields: dict[str, Any] = {
+            key: None if value is None else float(value)
+            for key, value in (
+                ("power", item.get_current_power()),
+                ("consumption", item.get_total_consumption()),
+                ("production", item.get_total_production()),
+                ("consumption_t1", item.get_consumption_tariff_T1()),
+                ("consumption_t2", item.get_consumption_tariff_T2()),
+            )
+        }
+        timestamp = f" {epoch_micros(item.meter.reading.time) * 1000}"
+    else:
+        core = item.device.core
+        tags = {"meter": item.meter.number, "device": item.device.id}
+        measurement += "_status"
+        fields = {
+            "connection_status": core.connection_status,
+            "power_status": core.power_status,
+            "battery_level": core.battery_level,
+            "rssi": core.rssi,
+            "bridge_rssi": item.device.bridge.rssi,
+        }
+        timestamp = ""
+
+    field_set = ",".join(
+        f"{key}={_field_value(value)}"
+        for key, value in fields.items()
+        if value is not None
+    )
+    if not field_set:
+        return None
+    tag_set = "".join(
+        f",{key}={_escape(value, ', =')}" for key, value in tags.items() if value
+    )
+    return f"{_escape(measurement, ', ')}{tag_set} {field_set}{timestamp}"
+
+
+def _field_value(value: Any) -> str:
+    if isinstance(value, str):
+        return '"' + _escape(value, '"') + '"'
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f"{value}i"
+    return repr(float(value))
+
+
+@dataclass
+class UDPLineProtocolSink:
+    """Sink sending items in the InfluxDB line protocol over UDP.
+
+    Lines of a batch are packed into as few datagrams as possible.
+
+    Attributes:
+        host: Address of the receiver
+        port: UDP port of the receiver
+        measurement: Name of the measurement, see to_line_protocol
+        max_datagram_size: Maximum number of bytes per datagram
+    """
+
+    host: str
+    port: int = 8089
+    measurement: str = "iometer"
+    max_datagram_size: int = 1400
+    _transport: Optional[asyncio.DatagramTransport] = field(
+        default=None, init=False, repr=False
+    )
+
+    async def write(self, items: list[Item]) -> None:
+        if self._transport is None:
+            loop = asyncio.get_running_loop()
+            self._transport, _protocol = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=(self.host, self.port)
+            )
+        datagram = bytearray()
+        for item in items:
+            line = to_line_protocol(item, self.measurement)
+            if line is None:
+                continue
+            encoded = line.encode() + b"\n"
+            if datagram and len(datagram) + len(encoded) > self.max_datagram_size:
+                self._transport.sendto(bytes(datagram))
+                datagram.clear()
+            datagram += encoded
+        if datagram:
+            self._transport.sendto(bytes(datagram))
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+@dataclass
+class CallbackSink:
+    """Sink passing each batch to a function or coroutine function.
+
+    Attributes:
+        callback: Called with the list of items of each batch
+    """
+
+    callback: Callable[[list[Item]], Awaitable[None] | None]
+
+    async def write(self, items: list[Item]) -> None:
+        result = self.callback(items)
+        if inspect.isawaitable(result):
+            await result
+
+    async def close(self) -> None:
+        return None
+
+
+@dataclass
+class PipelineStats:
+    """Counters of a WriterPipeline.
+
+    Attributes:
+        queue_depth: Number of items waiting in the queue
+        max_queue_depth: Highest number of items that waited in the queue
+        items: Number of items handed to the sinks
+        batches: Number of batches handed to the sinks
+        failures: Number of failed writes of a batch to a sink
+        last_error: Exception of the last failed write
+        last_flush_latency: Seconds the last batch took to write to all sinks
+        max_flush_latency: Highest flush latency in seconds
+        total_flush_time: Seconds spent writing all batches
+    """
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    items: int = 0
+    batches: int = 0
+    failures: int = 0
+    last_error: BaseException | None = None
+    last_flush_latency: float | None = None
+    max_flush_latency: float = 0.0
+    total_flush_time: float = 0.0
+
+    @property
+    def mean_flush_latency(self) -> float | None:
+        """Get the average seconds a batch took to write to all sinks."""
+        return self.total_flush_time / self.batches if self.batches else None
+
+
+@dataclass
+class WriterPipeline:
+    """Bounded queue writing readings and statuses to sinks in batches.
+
+    Attributes:
+        sinks: Destinations of every batch, written to concurrently
+        max_batch_size: Number of items that trigger a flush
+        flush_interval: Seconds after the first item of a batch until it is
+            flushed, even if it is not full
+        max_queue_size: Number of queued items at which put() waits
+        stats: Queue depth, throughput and flush latency of the pipeline
+
+    Example:
+        sinks = [NDJSONSink("readings.ndjson"), UDPLineProtocolSink("influx")]
+        async with WriterPipeline(sinks) as pipeline:
+            async for reading in client.stream_readings():
+                await pipeline.put(reading)
+    """
+
+    sinks: Sequence[Sink]
+    max_batch_size: int = 500
+    flush_interval: float = 1.0
+    max_queue_size: int = 10000
+    stats: PipelineStats = field(default_factory=PipelineStats, init=False)
+    _queue: Optional[asyncio.Queue] = field(default=None, init=False, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    async def start(self) -> None:
+        """Start writing queued items in the background."""
+        if self._task is None:
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, item: Item) -> None:
+        """Queue an item, waiting while the queue is full.
+
+        Raises:
+            RuntimeError: If the pipeline is not running
+        """
+        queue = self._running_queue()
+        await queue.put(item)
+        self._update_depth(queue)
+
+    def put_nowait(self, item: Item) -> None:
+        """Queue an item without waiting.
+
+        Raises:
+            asyncio.QueueFull: If the queue is full
+            RuntimeError: If the pipeline is not running
+        """
+        queue = self._running_queue()
+        queue.put_nowait(item)
+        self._update_depth(queue)
+
+    async def close(self) -> None:
+        """Write all queued items, then close the sinks."""
+        if self._task is None or self._queue is None:
+            return
+        await self._queue.put(_STOP)
+        try:
+            await self._task
+        finally:
+            self._task = self._queue = None
+            await asyncio.gather(
+                *(sink.close() for sink in self.sinks), return_exceptions=True
+            )
+
+    def _running_queue(self) -> asyncio.Queue:
+        if self._queue is None or self._task is None or self._task.done():
+            raise RuntimeError("WriterPipeline is not running")
+        return self._queue
+
+    def _update_depth(self, queue: asyncio.Queue) -> None:
+        depth = queue.qsize()
+        self.stats.queue_depth = depth
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+    async def _run(self) -> None:
+        """Collect batches from the queue and flush them."""
+        queue = self._queue
+        assert queue is not None
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self.stats.queue_depth = queue.qsize()
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[Item]) -> None:
+        """Write a batch to all sinks and record the outcome."""
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(sink.write(batch) for sink in self.sinks), return_exceptions=True
+        )
+        latency = time.perf_counter() - start
+
+        stats = self.stats
+        stats.items += len(batch)
+        stats.batches += 1
+        stats.last_flush_latency = latency
+        stats.max_flush_latency = max(stats.max_flush_latency, latency)
+        stats.total_flush_time += latency
+        for result in results:
+            if isinstance(result, BaseException):
+                stats.failures += 1
+                stats.last_error = result
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await self.close()
@@ -1,12 +1,15 @@
 """IOmeter reading."""
 
-import json
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import Any, List, cast
 
+from . import codec
+from .obis import get_obis, intern_unit
+from .timestamps import format_timestamp, parse_timestamp
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Register:
     """Represents a meter register reading."""
 
@@ -15,19 +18,254 @@ class Register:
     unit: str
 
 
-@dataclass
+# Registers of payloads are created through the slots, which is faster than
+# the __init__ of the frozen dataclass.
+_new_object = object.__new__
+_set_obis = Register.__dict__["obis"].__set__
+_set_value = Register.__dict__["value"].__set__
+_set_unit = Register.__dict__["unit"].__set__
+
+
+def _make_register(obis: str, value: float, unit: str) -> Register:
+    """Create a Register like Register(obis, value, unit) does."""
+    register = _new_object(Register)
+    _set_obis(register, obis)
+    _set_value(register, value)
+    _set_unit(register, unit)
+    return register
+
+
+# Below this number of registers a linear scan is faster than an index.
+_MIN_INDEXED_REGISTERS = 10
+
+
+class RegisterList(list):
+    """List of registers that counts its modifications.
+
+    Short lists are searched linearly. For longer ones the OBIS index of the
+    registers is cached on the list together with the modification counter
+    it was built at, and rebuilt once the list changes.
+    """
+
+    # Without an __init__, creating the list stays as fast as for a list. The
+    # slots are unset until the list is modified or indexed.
+    __slots__ = ("version", "_index")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unpickling a list subclass would otherwise call the tracked append
+        # and extend before the slots are set.
+        return (RegisterList, (list(self),))
+
+    def find(self, obis: str) -> Register | None:
+        """Get the first register with an OBIS code."""
+        if len(self) < _MIN_INDEXED_REGISTERS:
+            for register in self:
+                if register.obis == obis:
+                    return register
+            return None
+        return self.obis_index().get(obis)
+
+    def obis_index(self) -> dict[str, Register]:
+        """Get the OBIS to register mapping, rebuilding it if stale."""
+        try:
+            version, index = self._index
+            if version == self.version:
+                return index
+        except AttributeError:
+            # First use, set the counter so that later lookups need no default.
+            self.version = getattr(self, "version", 0)
+        # Iterate in reverse so the first register wins for duplicate OBIS.
+        index = {reg.obis: reg for reg in reversed(self)}
+        self._index = (self.version, index)
+        return index
+
+
+def _track_modification(name: str) -> Any:
+    """Wrap a list method so that calling it bumps the version counter."""
+    method = getattr(list, name)
+
+    def wrapper(self: RegisterList, *args: Any, **kwargs: Any) -> Any:
+        self.version = getattr(self, "version", 0) + 1
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(RegisterList, _name, _track_modification(_name))
+
+
+@dataclass(slots=True)
 class MeterReading:
-    """Represents a point-in-time reading."""
+    """Represents a point-in-time reading.
+
+    Registers are kept in a RegisterList, which looks them up through an
+    OBIS index once there are enough of them to make it pay off. Register
+    lists other than a RegisterList are copied into one when assigned, so
+    later changes to the original list are not seen.
+    """
 
     time: datetime
     registers: List[Register]
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "registers" and not isinstance(value, RegisterList):
+            value = RegisterList(value)
+        object.__setattr__(self, name, value)
+
     def get_register_by_obis(self, obis: str) -> Register | None:
         """Get register by OBIS code."""
-        return next((reg for reg in self.registers if reg.obis == obis), None)
+        return cast(RegisterList, self.registers).find(obis)
 
+    def get_registers(self, *obis: str) -> tuple[Register | None, ...]:
+        """Get several registers by OBIS code in one call.
+
+        Returns a tuple with one entry per requested OBIS code, None for
+        codes not present in this reading.
+        """
+        registers = cast(RegisterList, self.registers)
+        if len(registers) < _MIN_INDEXED_REGISTERS:
+            return tuple(registers.find(code) for code in obis)
+        index = registers.obis_index()
+        return tuple(index.get(code) for code in obis)
+
+
+# Slots of MeterReading, a LazyMeterReading stores materialized values there.
+_TIME_SLOT = MeterReading.__dict__["time"]
+_REGISTERS_SLOT = MeterReading.__dict__["registers"]
+
+
+class LazyMeterReading(MeterReading):
+    """MeterReading that keeps the decoded payload and parses on access.
+
+    The timestamp is parsed and the registers are created only when they
+    are accessed. Looking up single registers by OBIS code creates only the
+    requested registers, so power-only consumers never build the full list.
+
+    time and registers may also be passed as for MeterReading, as
+    dataclasses.replace does. They are then used instead of the payload.
+    """
+
+    __slots__ = ("_raw", "_raw_index", "_created")
+
+    # pylint: disable-next=super-init-not-called
+    def __init__(
+        self,
+        raw: dict[str, Any] | None = None,
+        time: datetime | None = None,
+        registers: List[Register] | None = None,
+    ) -> None:
+        object.__setattr__(self, "_raw", {} if raw is None else raw)
+        object.__setattr__(self, "_raw_index", None)
+        object.__setattr__(self, "_created", {})
+        if time is not None:
+            self.time = time
+        if registers is not None:
+            self.registers = registers
+
+    @property
+    def time(self) -> datetime:
+        """Timestamp of the reading, parsed on first access."""
+        try:
+            return _TIME_SLOT.__get__(self)
+        except AttributeError:
+            value = parse_timestamp(self._raw["time"])
+            _TIME_SLOT.__set__(self, value)
+            return value
+
+    @time.setter
+    def time(self, value: datetime) -> None:
+        _TIME_SLOT.__set__(self, value)
+
+    @property
+    def registers(self) -> List[Register]:
+        """Registers of the reading, created on first access."""
+        try:
+            return _REGISTERS_SLOT.__get__(self)
+        except AttributeError:
+            pass
+
+        # Reuse registers that were already created by OBIS lookups.
+        raw_index = self._raw_index or {}
+        registers = []
+        for raw in self._raw["registers"]:
+            register = self._created.get(raw["obis"])
+            if register is None or raw_index.get(raw["obis"]) is not raw:
+                register = _make_register(
+                    get_obis(raw["obis"]), raw["value"], intern_unit(raw["unit"])
+                )
+            registers.append(register)
+        value = RegisterList(registers)
+        _REGISTERS_SLOT.__set__(self, value)
+        return value
+
+    @registers.setter
+    def registers(self, value: List[Register]) -> None:
+        if not isinstance(value, RegisterList):
+            value = RegisterList(value)
+        _REGISTERS_SLOT.__set__(self, value)
+
+    def _materialized(self) -> bool:
+        """Check whether the register list has been created."""
+        try:
+            _REGISTERS_SLOT.__get__(self)
+        except AttributeError:
+            return False
+        return True
 
-@dataclass
+    def get_register_by_obis(self, obis: str) -> Register | None:
+        """Get register by OBIS code."""
+        if self._materialized():
+            return MeterReading.get_register_by_obis(self, obis)
+
+        register = self._created.get(obis)
+        if register is None:
+            raw_index = self._raw_index
+            if raw_index is None:
+                # Iterate in reverse so the first register wins for duplicate OBIS.
+                raw_registers = reversed(self._raw["registers"])
+                raw_index = {raw["obis"]: raw for raw in raw_registers}
+                object.__setattr__(self, "_raw_index", raw_index)
+            raw = raw_index.get(obis)
+            if raw is None:
+                return None
+            register = _make_register(
+                get_obis(obis), raw["value"], intern_unit(raw["unit"])
+            )
+            self._created[obis] = register
+        return register
+
+    def get_registers(self, *obis: str) -> tuple[Register | None, ...]:
+        """Get several registers by OBIS code in one call."""
+        if self._materialized():
+            return MeterReading.get_registers(self, *obis)
+        return tuple(self.get_register_by_obis(code) for code in obis)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MeterReading):
+            return NotImplemented
+        return (self.time, self.registers) == (other.time, other.registers)
+
+    def __repr__(self) -> str:
+        return f"LazyMeterReading(time={self.time!r}, registers={self.registers!r})"
+
+
+@dataclass(slots=True)
 class Meter:
     """Represents the meter device."""
 
@@ -35,7 +273,7 @@ class Meter:
     reading: MeterReading
 
 
-@dataclass
+@dataclass(slots=True)
 class Reading:
     """Top level class representing a complete meter reading."""
 
@@ -43,29 +281,43 @@ class Reading:
     typename: str = "iometer.reading.v1"
 
     # OBIS code constants
-    TOTAL_CONSUMPTION_OBIS = "01-00:01.08.00*ff"
-    TOTAL_PRODUCTION_OBIS = "01-00:02.08.00*ff"
-    CURRENT_POWER_OBIS = "01-00:10.07.00*ff"
-    CURRENT_POWER_OBIS_ALT = "01-00:24.07.00*ff"
-    CONSUMPTION_TARIFF_T1_OBIS = "01-00:01.08.01*ff"
-    CONSUMPTION_TARIFF_T2_OBIS = "01-00:01.08.02*ff"
+    TOTAL_CONSUMPTION_OBIS = get_obis("01-00:01.08.00*ff")
+    TOTAL_PRODUCTION_OBIS = get_obis("01-00:02.08.00*ff")
+    CURRENT_POWER_OBIS = get_obis("01-00:10.07.00*ff")
+    CURRENT_POWER_OBIS_ALT = get_obis("01-00:24.07.00*ff")
+    CONSUMPTION_TARIFF_T1_OBIS = get_obis("01-00:01.08.01*ff")
+    CONSUMPTION_TARIFF_T2_OBIS = get_obis("01-00:01.08.02*ff")
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Reading":
-        """Create Reading instance from JSON string."""
-        data = json.loads(json_str)
+    def from_json(cls, json_str: codec.Payload, lazy: bool = False) -> "Reading":
+        """Create Reading instance from JSON string or undecoded bytes.
+
+        With lazy enabled, the timestamp and registers are only parsed when
+        they are accessed, see LazyMeterReading.
+        """
+        return cls.from_dict(codec.loads(json_str), lazy=lazy)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], lazy: bool = False) -> "Reading":
+        """Create Reading instance from a decoded JSON payload."""
+        if lazy:
+            meter = Meter(
+                number=data["meter"]["number"],
+                reading=LazyMeterReading(data["meter"]["reading"]),
+            )
+            return cls(meter=meter)
 
         # Create registers
-        registers = [
-            Register(obis=reg["obis"], value=reg["value"], unit=reg["unit"])
+        registers = RegisterList(
+            _make_register(
+                get_obis(reg["obis"]), reg["value"], intern_unit(reg["unit"])
+            )
             for reg in data["meter"]["reading"]["registers"]
-        ]
+        )
 
         # Create meter reading
         meter_reading = MeterReading(
-            time=datetime.fromisoformat(
-                data["meter"]["reading"]["time"].replace("Z", "+00:00")
-            ),
+            time=parse_timestamp(data["meter"]["reading"]["time"]),
             registers=registers,
         )
 
@@ -77,13 +329,13 @@ class Reading:
 
     def to_json(self) -> str:
         """Convert the status to JSON string"""
-        return json.dumps(
+        return codec.dumps(
             {
                 "__typename": self.typename,
                 "meter": {
                     "number": self.meter.number,
                     "reading": {
-                        "time": self.meter.reading.time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        "time": format_timestamp(self.meter.reading.time),
                         "registers": [
                             {
                                 "obis": register.obis,
@@ -97,6 +349,24 @@ class Reading:
             }
         )
 
+    def to_bytes(self) -> bytes:
+        """Convert the reading to the compact binary format of iometer.binary.
+
+        Values are stored as float64 and the time as UTC with microsecond
+        precision, naive times are taken as UTC.
+        """
+        # Imported here, iometer.binary builds on this module.
+        from .binary import dumps_reading  # pylint: disable=import-outside-toplevel
+
+        return dumps_reading(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> "Reading":
+        """Create Reading instance from the output of to_bytes."""
+        from .binary import loads_reading  # pylint: disable=import-outside-toplevel
+
+        return loads_reading(data)
+
     def get_total_consumption(self) -> float | None:
         """Get total consumption in Wh."""
         register = self.meter.reading.get_register_by_obis(self.TOTAL_CONSUMPTION_OBIS)
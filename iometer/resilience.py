@@ -0,0 +1,127 @@
+"""Adaptive timeouts and circuit breaking for requests to a bridge."""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .exceptions import IOmeterCircuitOpenError
+
+
+@dataclass
+class AdaptiveTimeout:
+    """Request timeout derived from the observed latency of a bridge.
+
+    Tracks an exponentially weighted moving average of the latency and of
+    its deviation, like the TCP retransmission timeout (RFC 6298). The
+    timeout is the average plus deviation_factor times the deviation,
+    limited to the range from minimum to maximum.
+
+    Attributes:
+        minimum: Lower limit of the timeout in seconds
+        maximum: Upper limit of the timeout in seconds, used until the
+            first response has been observed
+        alpha: Weight of a new sample in the latency average
+        beta: Weight of a new sample in the deviation average
+        deviation_factor: Multiple of the deviation added to the average
+    """
+
+    minimum: float = 1.0
+    maximum: float = 60.0
+    alpha: float = 0.125
+    beta: float = 0.25
+    deviation_factor: float = 4.0
+    mean: float | None = field(default=None, init=False)
+    deviation: float = field(default=0.0, init=False)
+
+    @property
+    def timeout(self) -> float:
+        """Get the current timeout in seconds."""
+        if self.mean is None:
+            return self.maximum
+        timeout = self.mean + self.deviation_factor * self.deviation
+        return min(self.maximum, max(self.minimum, timeout))
+
+    def observe(self, latency: float) -> None:
+        """Add the latency in seconds of a successful request."""
+        if self.mean is None:
+            self.mean = latency
+            self.deviation = latency / 2
+            return
+        self.deviation += self.beta * (abs(latency - self.mean) - self.deviation)
+        self.mean += self.alpha * (latency - self.mean)
+
+    def record_timeout(self) -> None:
+        """Back off after a request timed out by doubling the timeout."""
+        if self.mean is not None:
+            self.deviation = (2 * self.timeout - self.mean) / self.deviation_factor
+
+
+@dataclass
+class CircuitBreaker:
+    """Fail fast after repeated failures of a bridge.
+
+    The circuit opens after failure_threshold consecutive failures. While
+    open, requests fail immediately with IOmeterCircuitOpenError. After
+    reset_timeout seconds it becomes half-open and lets a single probe
+    request through: success closes the circuit, failure opens it again.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds to wait before probing an open circuit
+        clock: Monotonic clock returning seconds
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    failures: int = field(default=0, init=False)
+    opened_at: float | None = field(default=None, init=False)
+    probe_started_at: float | None = field(default=None, init=False)
+
+    @property
+    def state(self) -> str:
+        """Get the state of the circuit."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before_request(self) -> None:
+        """Check whether a request may be sent.
+
+        Raises:
+            IOmeterCircuitOpenError: If the circuit is open or a probe of the
+                half-open circuit is already in flight
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return
+        now = self.clock()
+        if state == self.HALF_OPEN and (
+            # A probe that never reported back does not block forever.
+            self.probe_started_at is None
+            or now - self.probe_started_at >= self.reset_timeout
+        ):
+            self.probe_started_at = now
+            return
+        raise IOmeterCircuitOpenError(
+            f"Circuit open after {self.failures} failures of IOmeter bridge"
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit after the bridge answered."""
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit if needed."""
+        self.failures += 1
+        if self.probe_started_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self.probe_started_at = None
@@ -0,0 +1,316 @@
+"""Polling many IOmeter bridges on per-endpoint schedules.
+
+A PollScheduler polls the reading and status endpoints of every target at
+their own intervals, e.g. readings every second and the status every five
+minutes. Start times are spread over the interval, so that targets do not
+all poll at the same moment. At most max_in_flight polls run at once; when
+more are due, those of targets with a higher priority start first.
+
+Polls run at a fixed rate: the next poll is due one interval after the
+previous one was due, not after it finished. If a target falls behind by
+more than an interval, the polls it missed are skipped and counted instead
+of being run in a burst. How late polls start against their schedule is
+kept per endpoint in LatenessStats.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import math
+import random
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Generic, Optional, Self, TypeVar
+
+from .client import IOmeterClient
+from .reading import Reading
+from .status import Status
+
+T = TypeVar("T")
+
+READING = "reading"
+STATUS = "status"
+
+
+@dataclass
+class PollTarget:
+    """A bridge polled by a PollScheduler.
+
+    Attributes:
+        client: Client of the bridge, opened by the caller
+        priority: Targets with a higher priority start first when the number
+            of polls in flight is at its limit
+        reading_interval: Seconds between readings, None to not poll them
+        status_interval: Seconds between statuses, None to not poll them
+    """
+
+    client: IOmeterClient
+    priority: int = 0
+    reading_interval: float | None = 1.0
+    status_interval: float | None = 300.0
+
+
+@dataclass
+class PollResult(Generic[T]):
+    """Outcome of a scheduled poll.
+
+    Exactly one of value and error is set.
+
+    Attributes:
+        host: The bridge that was polled
+        endpoint: READING or STATUS
+        scheduled: Event loop time the poll was due at
+        lateness: Seconds the poll started after it was due
+        value: The Reading or Status
+        error: The error raised by the client, usually an IOmeterError, or
+            e.g. a parse error for a malformed response
+    """
+
+    host: str
+    endpoint: str
+    scheduled: float
+    lateness: float
+    value: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the bridge answered successfully."""
+        return self.error is None
+
+
+@dataclass
+class LatenessStats:
+    """Seconds polls started after they were due.
+
+    Attributes:
+        maxlen: Number of recent polls kept for percentiles
+        count: Number of polls started
+        total: Sum of the lateness of all polls
+        max: Highest lateness of all polls
+        missed: Number of polls skipped because the target fell behind
+    """
+
+    maxlen: int = 1000
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    missed: int = 0
+    recent: deque[float] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.recent = deque(maxlen=self.maxlen)
+
+    def observe(self, lateness: float) -> None:
+        """Add the lateness of a poll."""
+        self.count += 1
+        self.total += lateness
+        self.max = max(self.max, lateness)
+        self.recent.append(lateness)
+
+    @property
+    def mean(self) -> float | None:
+        """Get the average lateness of all polls."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Get a percentile of the lateness of the recent polls.
+
+        Args:
+            percent: The percentile between 0 and 100, e.g. 99
+        Returns:
+            The lateness in seconds, None if no poll started yet
+        """
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        index = math.ceil(percent / 100 * len(ordered)) - 1
+        return ordered[min(max(index, 0), len(ordered) - 1)]
+
+    @property
+    def p99(self) -> float | None:
+        """Get the 99th percentile of the lateness of the recent polls."""
+        return self.percentile(99)
+
+
+@dataclass(slots=True)
+class _Job:
+    """One endpoint of one target and when it is due next."""
+
+    target: PollTarget
+    endpoint: str
+    interval: float
+    due: float
+
+
+@dataclass
+class PollScheduler:
+    """Poll many bridges with per-endpoint intervals and priorities.
+
+    Every result is passed to callback, which may be a function or a
+    coroutine function. A poll keeps its slot until the callback returns,
+    so a slow consumer, e.g. a full WriterPipeline, slows down polling.
+
+    Attributes:
+        targets: The bridges to poll
+        callback: Called with the PollResult of every poll
+        max_in_flight: Maximum number of polls running at once
+        stagger: Spread the first polls of the targets evenly over the
+            interval instead of starting all at once
+        jitter: Random extra delay of the first poll, as a fraction of the
+            interval
+        stats: Lateness of the polls by endpoint
+        callback_failures: Number of calls of callback that raised
+        last_callback_error: Exception of the last failed call of callback
+
+    Example:
+        async with IOmeterFleet(hosts) as fleet, WriterPipeline(sinks) as pipe:
+            targets = [PollTarget(client) for client in fleet.clients.values()]
+
+            async def store(result):
+                if result.ok:
+                    await pipe.put(result.value)
+
+            async with PollScheduler(targets, store):
+                await asyncio.sleep(3600)
+    """
+
+    targets: Sequence[PollTarget]
+    callback: Callable[[PollResult[Any]], Awaitable[None] | None]
+    max_in_flight: int = 50
+    stagger: bool = True
+    jitter: float = 0.0
+    stats: dict[str, LatenessStats] = field(
+        default_factory=lambda: {READING: LatenessStats(), STATUS: LatenessStats()},
+        init=False,
+    )
+    callback_failures: int = field(default=0, init=False)
+    last_callback_error: Exception | None = field(default=None, init=False)
+    _timers: list[tuple[float, int, _Job]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _ready: list[tuple[int, float, int, _Job]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _counter: Any = field(default_factory=itertools.count, init=False, repr=False)
+    _wake: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+    _tasks: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of polls running."""
+        return len(self._tasks)
+
+    async def start(self) -> None:
+        """Schedule the first polls and start polling in the background."""
+        if self._task is not None:
+            return
+        now = asyncio.get_running_loop().time()
+        for endpoint, attribute in (
+            (READING, "reading_interval"),
+            (STATUS, "status_interval"),
+        ):
+            targets = [
+                target
+                for target in self.targets
+                if getattr(target, attribute) is not None
+            ]
+            for index, target in enumerate(targets):
+                interval = getattr(target, attribute)
+                offset = interval * index / len(targets) if self.stagger else 0.0
+                if self.jitter:
+                    offset += random.uniform(0.0, self.jitter * interval)
+                self._schedule(_Job(target, endpoint, interval, now + offset))
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop polling and cancel the polls in flight."""
+        tasks = list(self._tasks)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._tasks.clear()
+        self._timers.clear()
+        self._ready.clear()
+
+    def _schedule(self, job: _Job) -> None:
+        heapq.heappush(self._timers, (job.due, next(self._counter), job))
+
+    async def _run(self) -> None:
+        """Start due polls by priority while below the in-flight limit."""
+        loop = asyncio.get_running_loop()
+        timers, ready = self._timers, self._ready
+        while True:
+            self._wake.clear()
+            now = loop.time()
+            while timers and timers[0][0] <= now:
+                due, order, job = heapq.heappop(timers)
+                heapq.heappush(ready, (-job.target.priority, due, order, job))
+            while ready and len(self._tasks) < self.max_in_flight:
+                job = heapq.heappop(ready)[3]
+                task = asyncio.create_task(self._poll(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._done)
+
+            # Wait for the next due poll, or for a slot or a new schedule.
+            timer = None
+            if timers and not ready:
+                timer = loop.call_at(timers[0][0], self._wake.set)
+            await self._wake.wait()
+            if timer is not None:
+                timer.cancel()
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._wake.set()
+
+    async def _poll(self, job: _Job) -> None:
+        """Poll an endpoint, pass on the result and schedule the next poll."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        stats = self.stats[job.endpoint]
+        result: PollResult[Reading | Status] = PollResult(
+            host=job.target.client.host,
+            endpoint=job.endpoint,
+            scheduled=job.due,
+            lateness=max(started - job.due, 0.0),
+        )
+        stats.observe(result.lateness)
+        try:
+            client = job.target.client
+            try:
+                if job.endpoint == READING:
+                    result.value = await client.get_current_reading()
+                else:
+                    result.value = await client.get_current_status()
+            except Exception as error:  # pylint: disable=broad-except
+                result.error = error
+            try:
+                outcome = self.callback(result)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            except Exception as error:  # pylint: disable=broad-except
+                # Keep polling, a failing consumer must not stop the schedule.
+                self.callback_failures += 1
+                self.last_callback_error = error
+        finally:
+            job.due += job.interval
+            behind = loop.time() - job.due
+            if behind > 0:
+                missed = int(behind // job.interval)
+                stats.missed += missed
+                job.due += missed * job.interval
+            self._schedule(job)
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await self.close()
@@ -0,0 +1,31 @@
+"""Combined reading and status of an IOmeter bridge."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .reading import Reading
+from .status import Status
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """Reading and status of a bridge fetched concurrently.
+
+    Attributes:
+        fetched_at: Time in UTC at which both requests were started
+        reading: The current reading, None if the bridge has none yet
+        status: The current status, None if the bridge has none yet
+        reading_latency: Seconds until the reading request completed
+        status_latency: Seconds until the status request completed
+    """
+
+    fetched_at: datetime
+    reading: Reading | None
+    status: Status | None
+    reading_latency: float
+    status_latency: float
+
+    @property
+    def latency(self) -> float:
+        """Get the wall time in seconds of fetching the snapshot."""
+        return max(self.reading_latency, self.status_latency)
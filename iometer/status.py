@@ -1,10 +1,12 @@
 """Device status for IOmeter bridge and core"""
 
-import json
 from dataclasses import dataclass, field
+from typing import Any
 
+from . import codec
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Bridge:
     """Represents the bridge device status"""
 
@@ -12,7 +14,7 @@ class Bridge:
     version: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Core:
     """Represents the core device status"""
 
@@ -25,7 +27,7 @@ class Core:
     battery_level: int | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Device:
     """Represents the complete device information"""
 
@@ -34,7 +36,7 @@ class Device:
     core: Core
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Meter:
     """Represents the meter device."""
 
@@ -44,6 +46,8 @@ class Meter:
 class NullMeter(Meter):
     """Null Object for Meter to avoid None-attribute errors."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(number=None)
 
@@ -51,7 +55,7 @@ class NullMeter(Meter):
         return False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Status:
     """Top level class representing the complete device status"""
 
@@ -60,9 +64,13 @@ class Status:
     typename: str = "iometer.status.v1"
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Status":
-        """Create a Status instance from JSON string"""
-        data = json.loads(json_str)
+    def from_json(cls, json_str: codec.Payload) -> "Status":
+        """Create a Status instance from JSON string or undecoded bytes"""
+        return cls.from_dict(codec.loads(json_str))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Status":
+        """Create a Status instance from a decoded JSON payload"""
 
         # Create bridge
         bridge = Bridge(
@@ -96,7 +104,7 @@ class Status:
 
     def to_json(self) -> str:
         """Convert the status to JSON string"""
-        return json.dumps(
+        return codec.dumps(
             {
                 "__typename": self.typename,
                 # If meter is a NullMeter, serialize as null
@@ -0,0 +1,133 @@
+"""Synchronous IOmeter client for threaded, non-async code."""
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, Optional, Self, TypeVar
+
+from .client import IOmeterClient
+from .reading import Reading
+from .snapshot import Snapshot
+from .status import Status
+
+T = TypeVar("T")
+
+
+class IOmeterSyncClient:
+    """Blocking facade of IOmeterClient that is safe to share between threads.
+
+    The client runs one event loop in a background thread with one
+    IOmeterClient and its session, and forwards every call to it. Calling
+    asyncio.run() per request instead creates a new event loop, session and
+    TCP connection every time.
+
+    The background loop starts with the first call or on entering the
+    context manager and stops on close(), which cancels calls still in
+    flight. Calls from several threads run concurrently on the shared loop.
+
+    Example:
+        with IOmeterSyncClient("192.168.1.100") as client:
+            reading = client.get_current_reading()
+            status = client.get_current_status()
+    """
+
+    def __init__(self, host: str, **kwargs: Any) -> None:
+        """Create the client without starting the background loop.
+
+        Args:
+            host: The hostname or IP address of the IOmeter bridge
+            kwargs: Further keyword arguments for IOmeterClient
+        """
+        self.client = IOmeterClient(host, **kwargs)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background loop and open the session, if not running."""
+        self._start()
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """Start the background loop if not running and return it."""
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="iometer-sync-client", daemon=True
+            )
+            thread.start()
+            try:
+                # The session has to be created on the loop it is used on.
+                asyncio.run_coroutine_threadsafe(
+                    self.client.__aenter__(), loop
+                ).result()
+            except BaseException:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            self._loop, self._thread = loop, thread
+            return loop
+
+    def close(self) -> None:
+        """Close the session and stop the background loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                self._loop = self._thread = None
+
+    async def _shutdown(self) -> None:
+        """Cancel calls still in flight and close the session."""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.client.close()
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the background loop and wait for its result."""
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("IOmeterSyncClient called from its own event loop")
+        try:
+            loop = self._loop or self._start()
+        except BaseException:
+            coroutine.close()
+            raise
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def get_current_reading(self) -> Reading:
+        """Get current reading from IOmeter bridge, see IOmeterClient."""
+        return self._run(self.client.get_current_reading())
+
+    def get_current_status(self) -> Status:
+        """Get device status from IOmeter bridge, see IOmeterClient."""
+        return self._run(self.client.get_current_status())
+
+    def get_current_reading_raw(self) -> bytes:
+        """Get the current reading as undecoded JSON, see IOmeterClient."""
+        return self._run(self.client.get_current_reading_raw())
+
+    def get_current_status_raw(self) -> bytes:
+        """Get the device status as undecoded JSON, see IOmeterClient."""
+        return self._run(self.client.get_current_status_raw())
+
+    def get_snapshot(self) -> Snapshot:
+        """Get reading and status concurrently, see IOmeterClient."""
+        return self._run(self.client.get_snapshot())
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
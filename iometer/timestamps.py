@@ -0,0 +1,104 @@
+"""Parsing and formatting of the timestamps sent by the bridge.
+
+The bridge sends timestamps in the fixed format YYYY-MM-DDTHH:MM:SSZ.
+Consecutive readings often carry the same timestamp, so parsing and
+formatting remember their last result. A single entry costs less on a miss
+than an LRU cache, which would make distinct timestamps slower than no cache.
+
+Where timestamps are stored as numbers, naive datetimes are taken as UTC,
+like the timestamps of the bridge, see epoch_micros and from_epoch_micros.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat
+else:
+
+    def _fromisoformat(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Last argument and result, replaced as one tuple to be thread safe.
+_last_parsed: tuple[str, datetime] = ("", datetime.min)
+_last_formatted: tuple[datetime, str] = (datetime.min, "")
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp of the bridge.
+
+    Args:
+        value: Timestamp in ISO 8601 format, usually YYYY-MM-DDTHH:MM:SSZ
+    Returns:
+        The timestamp, timezone aware if value has a zone designator
+    Raises:
+        ValueError: If value is not an ISO 8601 timestamp
+    """
+    global _last_parsed  # pylint: disable=global-statement
+    last = _last_parsed
+    if value == last[0]:
+        return last[1]
+    result = _fromisoformat(value)
+    _last_parsed = (value, result)
+    return result
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a timestamp like the bridge does.
+
+    The wall time of value is written as is, it is not converted to UTC.
+
+    Args:
+        value: The timestamp to format
+    Returns:
+        The timestamp in the format YYYY-MM-DDTHH:MM:SSZ
+    """
+    global _last_formatted  # pylint: disable=global-statement
+    last = _last_formatted
+    # Compared by identity, equal instants in other zones format differently.
+    if value is last[0]:
+        return last[1]
+    if value.year < 1000:
+        # Keep the unpadded year that strftime produces on this platform.
+        result = value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    else:
+        # Formatting with % is about twice as fast as strftime.
+        # pylint: disable-next=consider-using-f-string
+        result = "%d-%02d-%02dT%02d:%02d:%02dZ" % (
+            value.year,
+            value.month,
+            value.day,
+            value.hour,
+            value.minute,
+            value.second,
+        )
+    _last_formatted = (value, result)
+    return result
+
+
+def epoch_micros(value: datetime) -> int:
+    """Get the microseconds since the epoch of a timestamp.
+
+    Args:
+        value: The timestamp, naive timestamps are taken as UTC
+    Returns:
+        The exact number of microseconds, unlike datetime.timestamp()
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_micros(value: int) -> datetime:
+    """Get the timestamp of a number of microseconds since the epoch.
+
+    Args:
+        value: The microseconds, as returned by epoch_micros
+    Returns:
+        The timestamp in UTC, exact unlike datetime.fromtimestamp()
+    """
+    return _EPOCH + value * _MICROSECOND
@@ -1,18 +1,48 @@
 """Tests for the IOmeter package."""
 
+import asyncio
+import copy
+import json
+import math
+import pickle
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError, asdict, replace
+from datetime import datetime, timedelta, timezone
+
 import pytest
-from aiohttp import ClientResponseError, ClientSession
+from aiohttp import ClientResponseError, ClientSession, DummyCookieJar
 from aioresponses import aioresponses
 
+from iometer import aggregate, analytics, archive, binary, bulk, codec
+from iometer.batch import ReadingBatch
 from iometer.client import IOmeterClient
 from iometer.exceptions import (
+    IOmeterCircuitOpenError,
     IOmeterConnectionError,
     IOmeterNoReadingsError,
     IOmeterNoStatusError,
     IOmeterTimeoutError,
 )
-from iometer.reading import Reading
+from iometer.fleet import IOmeterFleet
+from iometer.metrics import MetricsRegistry, MetricsRingBuffer
+from iometer.obis import Obis, get_obis, intern_unit
+from iometer.mock_bridge import FakeBridge, run_benchmark
+from iometer.pipeline import (
+    CallbackSink,
+    NDJSONSink,
+    UDPLineProtocolSink,
+    WriterPipeline,
+    to_line_protocol,
+)
+from iometer.reading import LazyMeterReading, Meter, MeterReading, Reading, Register
+from iometer.resilience import AdaptiveTimeout, CircuitBreaker
+from iometer.scheduler import READING, STATUS, LatenessStats, PollScheduler, PollTarget
 from iometer.status import NullMeter, Status
+from iometer.sync import IOmeterSyncClient
+from iometer.timestamps import format_timestamp, parse_timestamp
 
 HOST = "192.168.1.100"
 
@@ -455,3 +485,1177 @@ async def test_status_not_found(client_iometer, mock_aioresponse):
 
     with pytest.raises(IOmeterNoStatusError, match="No status available"):
         await client_iometer.get_current_status()
+
+
+@pytest.mark.asyncio
+async def test_fleet_poll_readings(mock_aioresponse, reading_json):
+    """Test polling readings from several bridges over one session."""
+    hosts = ["192.168.1.100", "192.168.1.101", "192.168.1.102", "192.168.1.103"]
+    for host in hosts[:2]:
+        mock_aioresponse.get(f"http://{host}/v1/reading", payload=reading_json)
+    mock_aioresponse.get(f"http://{hosts[2]}/v1/reading", status=404)
+    mock_aioresponse.get(f"http://{hosts[3]}/v1/reading", body="not json")
+
+    async with IOmeterFleet(hosts, max_concurrency=2) as fleet:
+        assert len({id(client.session) for client in fleet.clients.values()}) == 1
+        results = [result async for result in fleet.poll_readings()]
+
+    assert fleet.session is None
+    assert sorted(result.host for result in results) == hosts
+    by_host = {result.host: result for result in results}
+    assert by_host[hosts[0]].ok
+    assert by_host[hosts[0]].value.get_current_power() == 100
+    assert not by_host[hosts[2]].ok
+    assert isinstance(by_host[hosts[2]].error, IOmeterNoReadingsError)
+    # A malformed body fails only its own bridge.
+    assert isinstance(by_host[hosts[3]].error, ValueError)
+    assert by_host[hosts[1]].ok
+
+
+@pytest.mark.asyncio
+async def test_fleet_not_initialized():
+    """Test polling a fleet outside of its context raises."""
+    fleet = IOmeterFleet([HOST])
+    with pytest.raises(RuntimeError):
+        async for _ in fleet.poll_status():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_fleet_empty():
+    """Test polling a fleet without hosts yields nothing."""
+    async with IOmeterFleet([]) as fleet:
+        assert [result async for result in fleet.poll_readings()] == []
+        assert [result async for result in fleet.poll_status()] == []
+
+
+@pytest.mark.asyncio
+async def test_client_session_tuning():
+    """Test the client session reuses connections and skips cookies."""
+    async with IOmeterClient("test-host", limit_per_host=4) as client:
+        assert isinstance(client.session.cookie_jar, DummyCookieJar)
+        assert client.session.connector.limit_per_host == 4
+
+
+@pytest.mark.asyncio
+async def test_client_url_cached():
+    """Test endpoint URLs are built once per client."""
+    client = IOmeterClient("test-host", port=8080)
+    url = client._url("v1/reading")  # pylint: disable=protected-access
+    assert str(url) == "http://test-host:8080/v1/reading"
+    assert client._url("v1/reading") is url  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_stream_readings(client_iometer, mock_aioresponse, reading_json):
+    """Test streaming readings retries connection errors."""
+    mock_endpoint = f"http://{HOST}/v1/reading"
+    mock_aioresponse.get(mock_endpoint, payload=reading_json)
+    mock_aioresponse.get(mock_endpoint, exception=ClientResponseError)
+    mock_aioresponse.get(mock_endpoint, payload=reading_json, repeat=True)
+
+    readings = []
+    async for reading in client_iometer.stream_readings(interval=0.01):
+        readings.append(reading)
+        if len(readings) == 3:
+            break
+
+    assert [reading.get_current_power() for reading in readings] == [100] * 3
+
+
+@pytest.mark.asyncio
+async def test_stream_readings_skips_missed_ticks(
+    client_iometer, mock_aioresponse, reading_json, monkeypatch
+):
+    """Test a slow consumer does not cause a burst of queued polls."""
+    mock_endpoint = f"http://{HOST}/v1/reading"
+    mock_aioresponse.get(mock_endpoint, payload=reading_json, repeat=True)
+
+    class ManualClock:
+        """Stand-in for asyncio in the client, with a clock moved by sleeps."""
+
+        now = 0.0
+
+        def __getattr__(self, name):
+            return getattr(asyncio, name)
+
+        def get_running_loop(self):
+            return self
+
+        def time(self):
+            return self.now
+
+        async def sleep(self, delay):
+            self.now += max(delay, 0.0)
+            await asyncio.sleep(0)
+
+    clock = ManualClock()
+    monkeypatch.setattr("iometer.client.asyncio", clock)
+    times = []
+    async for _ in client_iometer.stream_readings(interval=0.02):
+        times.append(clock.now)
+        if len(times) == 1:
+            clock.now += 0.07  # The consumer stalls for three and a half ticks.
+        if len(times) == 3:
+            break
+
+    # After the stall the next poll waits for the next tick on the grid.
+    assert times == pytest.approx([0.0, 0.08, 0.1])
+
+
+@pytest.mark.asyncio
+async def test_get_current_reading_deduplicate(mock_aioresponse, reading_json):
+    """Test unchanged readings are returned without parsing them again."""
+    mock_endpoint = f"http://{HOST}/v1/reading"
+    mock_aioresponse.get(mock_endpoint, payload=reading_json)
+    mock_aioresponse.get(mock_endpoint, payload=reading_json)
+    updated_json = copy.deepcopy(reading_json)
+    updated_json["meter"]["reading"]["time"] = "2024-11-11T11:11:12Z"
+    mock_aioresponse.get(mock_endpoint, payload=updated_json)
+
+    async with IOmeterClient(HOST, deduplicate=True) as client:
+        first = await client.get_current_reading()
+        second = await client.get_current_reading()
+        third = await client.get_current_reading()
+
+    assert second is first
+    assert third is not first
+    assert third.meter.reading.time.second == 12
+
+
+@pytest.mark.asyncio
+async def test_stream_readings_changes_only(mock_aioresponse, reading_json):
+    """Test streaming only yields readings that changed."""
+    mock_endpoint = f"http://{HOST}/v1/reading"
+    updated_json = copy.deepcopy(reading_json)
+    updated_json["meter"]["reading"]["time"] = "2024-11-11T11:11:12Z"
+    for payload in (reading_json, reading_json, reading_json, updated_json):
+        mock_aioresponse.get(mock_endpoint, payload=payload)
+
+    async with IOmeterClient(HOST, deduplicate=True) as client:
+        readings = []
+        async for reading in client.stream_readings(0.001, changes_only=True):
+            readings.append(reading)
+            if len(readings) == 2:
+                break
+
+    assert [reading.meter.reading.time.second for reading in readings] == [11, 12]
+
+
+def test_register_index_follows_mutations(reading_json):
+    """Test OBIS lookups stay correct when registers are modified."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    meter_reading = reading.meter.reading
+    assert reading.get_current_power() == 100
+
+    meter_reading.registers[2] = Register("01-00:24.07.00*ff", 50, "W")
+    assert reading.get_current_power() == 50
+
+    meter_reading.registers.insert(0, Register("01-00:10.07.00*ff", 75, "W"))
+    assert reading.get_current_power() == 75
+
+    meter_reading.registers = [Register("01-00:01.08.01*ff", 10.0, "Wh")]
+    assert reading.get_current_power() is None
+    assert reading.get_consumption_tariff_T1() == 10.0
+
+    # Enough registers to be looked up through the index.
+    meter_reading.registers = [
+        Register(f"01-00:{32 + i:02d}.07.00*ff", 230.0, "V") for i in range(12)
+    ]
+    assert reading.get_current_power() is None
+    meter_reading.registers.append(Register("01-00:10.07.00*ff", 80, "W"))
+    assert reading.get_current_power() == 80
+    meter_reading.registers[-1] = Register("01-00:10.07.00*ff", 90, "W")
+    assert meter_reading.get_registers(
+        Reading.CURRENT_POWER_OBIS, "01-00:32.07.00*ff"
+    ) == (
+        Register("01-00:10.07.00*ff", 90, "W"),
+        Register("01-00:32.07.00*ff", 230.0, "V"),
+    )
+    del meter_reading.registers[-1]
+    assert reading.get_current_power() is None
+
+
+def test_register_list_pickle_and_sort(reading_json):
+    """Test readings with indexed registers pickle, sort and convert."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    assert reading.get_current_power() == 100
+
+    restored = pickle.loads(pickle.dumps(reading))
+    assert restored == reading
+    assert restored.get_current_power() == 100
+    assert list(asdict(reading.meter.reading)) == ["time", "registers"]
+
+    registers = reading.meter.reading.registers
+    registers.sort(key=lambda register: register.value, reverse=True)
+    assert [register.value for register in registers] == [5432.1, 1234.5, 100]
+    registers.insert(0, Register(Reading.CURRENT_POWER_OBIS, 75, "W"))
+    assert reading.get_current_power() == 75
+
+
+def test_get_registers(reading_json):
+    """Test bulk register lookup by OBIS code."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    consumption, missing = reading.meter.reading.get_registers(
+        Reading.TOTAL_CONSUMPTION_OBIS, Reading.CONSUMPTION_TARIFF_T1_OBIS
+    )
+    assert consumption.value == 1234.5
+    assert missing is None
+
+
+@pytest.mark.parametrize("backend", codec.available_backends())
+def test_codec_backends_identical(backend, reading_json, status_json):
+    """Test every JSON backend produces the same models and output."""
+    reading_str, status_str = json.dumps(reading_json), json.dumps(status_json)
+    codec.set_backend("json")
+    expected = (Reading.from_json(reading_str), Status.from_json(status_str))
+    try:
+        codec.set_backend(backend)
+        reading, status = Reading.from_json(reading_str), Status.from_json(status_str)
+    finally:
+        codec.set_backend()
+
+    assert (reading, status) == expected
+    assert reading.to_json() == expected[0].to_json()
+    assert status.to_json() == expected[1].to_json()
+
+
+def test_codec_unknown_backend():
+    """Test selecting an unavailable backend raises."""
+    with pytest.raises(ValueError):
+        codec.set_backend("simplejson")
+
+
+def test_models_are_slotted(reading_json, status_json):
+    """Test models carry no per-instance dict and value objects are hashable."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    status = Status.from_json(json.dumps(status_json))
+    register = reading.meter.reading.registers[0]
+
+    for model in (reading, reading.meter, reading.meter.reading, register, status):
+        assert not hasattr(model, "__dict__")
+    assert not hasattr(NullMeter(), "__dict__")
+    assert hash(register) == hash(Register(register.obis, register.value, "Wh"))
+    assert hash(status) == hash(Status.from_json(json.dumps(status_json)))
+    with pytest.raises(FrozenInstanceError):
+        register.value = 0
+
+
+def test_reading_batch(reading_json, reading_alt_obis_json):
+    """Test columnar storage of readings with differing registers."""
+    later_json = copy.deepcopy(reading_alt_obis_json)
+    later_json["meter"]["reading"]["time"] = "2024-11-11T11:11:12Z"
+    first = Reading.from_json(json.dumps(reading_json))
+
+    batch = ReadingBatch.from_readings([first])
+    batch.append_json(json.dumps(later_json))
+
+    assert len(batch) == 2
+    assert list(batch.times) == [1731323471, 1731323472]
+    assert list(batch.total_consumption()) == [1234.5, 1234.5]
+    assert list(batch.current_power()) == [100, 100]
+    assert math.isnan(batch.column(Reading.CURRENT_POWER_OBIS)[1])
+    assert all(math.isnan(value) for value in batch.consumption_tariff_T1())
+    assert batch[0] == first
+    assert batch[-1].get_current_power() == 100
+    later_time = batch.to_readings()[1].meter.reading.time
+    assert later_time == first.meter.reading.time.replace(second=12)
+
+
+def test_reading_batch_naive_times():
+    """Test batches store whole UTC seconds and read naive times as UTC."""
+    naive = datetime(2024, 11, 11, 11, 11, 11, 750000)
+    reading = Reading(meter=Meter("1ISK0000000000", MeterReading(naive, [])))
+    aware = naive.replace(tzinfo=timezone.utc)
+
+    batch = ReadingBatch.from_readings([reading])
+    assert batch[0].meter.reading.time == aware.replace(microsecond=0)
+    decoded = binary.loads_reading(binary.dumps_reading(reading))
+    assert decoded.meter.reading.time == aware
+
+    # Fractions are dropped towards the past, also before the epoch.
+    meter = {"number": "1", "reading": {"time": "1969-12-31T23:59:59.5Z"}}
+    meter["reading"]["registers"] = []
+    batch.append_dict({"meter": meter})
+    assert batch.times[-1] == -1
+
+
+def make_batch(times, consumption, production=None):
+    """Create a batch from time and counter columns."""
+    batch = ReadingBatch(
+        times=array("q", times), numbers=["1ISK0000000000"] * len(times)
+    )
+    batch.columns[Reading.TOTAL_CONSUMPTION_OBIS] = array("d", consumption)
+    if production is not None:
+        batch.columns[Reading.TOTAL_PRODUCTION_OBIS] = array("d", production)
+    return batch
+
+
+def test_interval_deltas_reset_and_gap():
+    """Test counter resets and gaps in interval deltas."""
+    times = [0, 10, 20, 30, 100, 110]
+    values = [100.0, 110.0, math.nan, 5.0, 25.0, 30.0]
+    deltas = analytics.interval_deltas(times, values, max_gap=60)
+
+    assert math.isnan(deltas[0])
+    assert deltas[1] == 10.0
+    assert math.isnan(deltas[2])
+    assert deltas[3] == 5.0  # Counter reset from 110 to 5
+    assert math.isnan(deltas[4])  # Gap of 70 seconds
+    assert deltas[5] == 5.0
+
+
+def test_load_profile_and_peak():
+    """Test energy is split across periods and the peak period is found."""
+    batch = make_batch([0, 600, 1200, 1800], [0.0, 100.0, 400.0, 500.0])
+    profile = analytics.load_profile(batch, period=900)
+
+    assert list(profile.starts) == [0, 900, 1800]
+    assert list(profile.energy)[:2] == [250.0, 250.0]
+    assert list(profile.power())[:2] == [1000.0, 1000.0]
+    assert math.isnan(profile.energy[2])  # No interval ends after 1800
+    assert analytics.peak_demand(batch, period=900) == (0, 1000.0)
+
+
+def test_energy_balance():
+    """Test consumption and production per period."""
+    batch = make_batch([0, 900, 1799], [0.0, 100.0, 150.0], [0.0, 20.0, 120.0])
+    balance = analytics.energy_balance(batch, period=900)
+
+    assert list(balance.starts) == [0, 900]
+    assert list(balance.consumption) == [100.0, 50.0]
+    assert list(balance.production) == [20.0, 100.0]
+    assert list(balance.net()) == [80.0, -50.0]
+    assert balance.totals() == (150.0, 120.0)
+
+
+@pytest.mark.asyncio
+async def test_fake_bridge():
+    """Test the client against the fake bridge over a real connection."""
+    async with FakeBridge(register_count=10, seed=1) as bridge:
+        async with bridge.client() as client:
+            status = await client.get_current_status()
+            reading = await client.get_current_reading()
+            bridge.not_found_rate = 1.0
+            with pytest.raises(IOmeterNoReadingsError):
+                await client.get_current_reading()
+
+    assert status.device.core.battery_level == 100
+    assert len(reading.meter.reading.registers) == 10
+    assert reading.get_current_power() == 360
+    assert bridge.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark():
+    """Test the benchmark runner reports latency and throughput."""
+    result = await run_benchmark(
+        bridges=3, requests_per_bridge=20, latency=0.002, error_rate=0.2, seed=1
+    )
+
+    assert result.requests == 60
+    assert 0 < result.errors < 60
+    assert result.p50 >= 0.002
+    assert result.p50 <= result.p99 <= result.latencies[-1]
+    assert result.requests_per_second > 0
+
+
+@pytest.mark.asyncio
+async def test_request_metrics():
+    """Test per-request timings are reported to the metrics sinks."""
+    ring_buffer = MetricsRingBuffer(maxlen=2)
+    registry = MetricsRegistry()
+
+    def sink(metrics):
+        ring_buffer(metrics)
+        registry(metrics)
+
+    async with FakeBridge() as bridge:
+        async with bridge.client(metrics=sink) as client:
+            await client.get_current_reading()
+            await client.get_current_status()
+            bridge.not_found_rate = 1.0
+            with pytest.raises(IOmeterNoStatusError):
+                await client.get_current_status()
+
+    status, failed = ring_buffer.snapshot()
+    assert status.endpoint == "v1/status"
+    assert status.connection_reused is True
+    assert status.status == 200
+    assert status.size > 0
+    assert None not in (status.ttfb, status.read, status.parse, status.total)
+    assert failed.error == "IOmeterNoStatusError"
+    assert failed.status == 404
+
+    rendered = registry.render()
+    assert 'endpoint="v1/reading",outcome="ok"} 1' in rendered
+    assert 'outcome="IOmeterNoStatusError"} 1' in rendered
+    assert 'phase="connect",le="+Inf"} 1' in rendered
+
+
+@pytest.mark.asyncio
+async def test_failing_metrics_sink():
+    """Test a failing metrics sink hides neither results nor errors."""
+
+    def sink(metrics):
+        raise RuntimeError("sink failed")
+
+    async with FakeBridge() as bridge:
+        async with bridge.client(metrics=sink) as client:
+            assert (await client.get_current_reading()).get_current_power() == 360
+            bridge.not_found_rate = 1.0
+            with pytest.raises(IOmeterNoReadingsError):
+                await client.get_current_reading()
+
+
+def test_adaptive_timeout():
+    """Test the timeout follows the observed latency."""
+    adaptive = AdaptiveTimeout(minimum=0.1, maximum=60.0)
+    assert adaptive.timeout == 60.0
+
+    for _ in range(50):
+        adaptive.observe(0.2)
+    assert adaptive.timeout == pytest.approx(0.2, rel=0.05)
+
+    timeout = adaptive.timeout
+    adaptive.record_timeout()
+    assert adaptive.timeout == pytest.approx(2 * timeout)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_applied():
+    """Test a slow response times out after the adapted timeout."""
+    adaptive = AdaptiveTimeout(minimum=0.05)
+    async with FakeBridge() as bridge:
+        async with bridge.client(adaptive_timeout=adaptive) as client:
+            for _ in range(5):
+                await client.get_current_status()
+            bridge.latency = 0.5
+            start = time.perf_counter()
+            with pytest.raises(IOmeterTimeoutError):
+                await client.get_current_status()
+            elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.25
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker(mock_aioresponse, reading_json):
+    """Test requests fail fast while the circuit is open and probe afterwards."""
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=30, clock=lambda: now[0]
+    )
+    mock_endpoint = f"http://{HOST}/v1/reading"
+    mock_aioresponse.get(mock_endpoint, status=500)
+    mock_aioresponse.get(mock_endpoint, status=404)
+    mock_aioresponse.get(mock_endpoint, status=500)
+    mock_aioresponse.get(mock_endpoint, status=500)
+    mock_aioresponse.get(mock_endpoint, payload=reading_json)
+
+    async with IOmeterClient(HOST, circuit_breaker=breaker) as client:
+        with pytest.raises(IOmeterConnectionError):
+            await client.get_current_reading()
+        # A 404 means the bridge is alive and resets the failure count.
+        with pytest.raises(IOmeterNoReadingsError):
+            await client.get_current_reading()
+        for _ in range(2):
+            with pytest.raises(IOmeterConnectionError):
+                await client.get_current_reading()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(IOmeterCircuitOpenError):
+            await client.get_current_reading()
+
+        now[0] = 30.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        reading = await client.get_current_reading()
+
+    assert reading.get_current_power() == 100
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_failed_probe():
+    """Test a failed probe opens the circuit again and only one probe runs."""
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+    )
+    breaker.record_failure()
+    now[0] = 10.0
+
+    breaker.before_request()
+    with pytest.raises(IOmeterCircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_coalesce_concurrent_requests():
+    """Test concurrent calls share a single request to the bridge."""
+    async with FakeBridge(latency=0.05) as bridge:
+        async with bridge.client(coalesce=True) as client:
+            readings = await asyncio.gather(
+                *(client.get_current_reading() for _ in range(3))
+            )
+            await client.get_current_reading()
+
+    assert readings[0] is readings[1] is readings[2]
+    assert bridge.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl():
+    """Test results are served from cache until invalidated."""
+    async with FakeBridge() as bridge:
+        async with bridge.client(status_cache_ttl=60) as client:
+            first = await client.get_current_status()
+            second = await client.get_current_status()
+            await client.get_current_reading()
+            await client.get_current_reading()
+            client.invalidate_cache("status")
+            third = await client.get_current_status()
+
+    assert second is first
+    assert third is not first
+    assert bridge.requests == 4
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot():
+    """Test reading and status are fetched concurrently."""
+    async with FakeBridge(latency=0.1) as bridge:
+        async with bridge.client() as client:
+            start = time.perf_counter()
+            snapshot = await client.get_snapshot()
+            elapsed = time.perf_counter() - start
+
+    assert snapshot.reading.get_current_power() == 360
+    assert snapshot.status.device.core.battery_level == 100
+    assert snapshot.reading_latency >= 0.1
+    assert snapshot.status_latency >= 0.1
+    assert elapsed < 0.19
+    assert snapshot.fetched_at.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_partial(client_iometer, mock_aioresponse, status_json):
+    """Test a missing reading still returns the status."""
+    mock_aioresponse.get(f"http://{HOST}/v1/reading", status=404)
+    mock_aioresponse.get(f"http://{HOST}/v1/status", payload=status_json)
+
+    snapshot = await client_iometer.get_snapshot()
+
+    assert snapshot.reading is None
+    assert snapshot.status.meter.number == "1ISK0000000000"
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_error(client_iometer, mock_aioresponse, status_json):
+    """Test connection errors are raised."""
+    mock_aioresponse.get(f"http://{HOST}/v1/reading", status=500)
+    mock_aioresponse.get(f"http://{HOST}/v1/status", payload=status_json)
+
+    with pytest.raises(IOmeterConnectionError):
+        await client_iometer.get_snapshot()
+
+
+def test_lazy_reading(reading_json, reading_alt_obis_json):
+    """Test lazy readings only create what is accessed and match eager ones."""
+    eager = Reading.from_json(json.dumps(reading_json))
+    lazy = Reading.from_json(json.dumps(reading_json), lazy=True)
+    meter_reading = lazy.meter.reading
+
+    assert isinstance(meter_reading, LazyMeterReading)
+    assert lazy.get_current_power() == 100
+    assert list(meter_reading._created) == [  # pylint: disable=protected-access
+        Reading.CURRENT_POWER_OBIS
+    ]
+    power = meter_reading.get_register_by_obis(Reading.CURRENT_POWER_OBIS)
+
+    assert lazy == eager
+    assert meter_reading.registers[2] is power
+    assert lazy.to_json() == eager.to_json()
+
+    meter_reading.registers.pop()
+    assert lazy.get_current_power() is None
+
+    alt = Reading.from_json(json.dumps(reading_alt_obis_json), lazy=True)
+    assert alt.get_current_power() == 100
+    assert alt.meter.reading.time == eager.meter.reading.time
+
+    later = replace(alt.meter.reading, time=alt.meter.reading.time + timedelta(1))
+    assert later.registers == alt.meter.reading.registers
+    assert later.time.day == 12
+    assert copy.copy(meter_reading) == meter_reading
+
+
+def test_parse_timestamp():
+    """Test the fast path matches fromisoformat and edge cases fall back."""
+    for value in (
+        "2024-11-11T11:11:11Z",
+        "2024-02-29T23:59:59Z",
+        "2024-11-11T11:11:11.250Z",
+        "2024-11-11T12:11:11+01:00",
+    ):
+        expected = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        assert parse_timestamp(value) == expected
+        assert parse_timestamp(value).utcoffset() == expected.utcoffset()
+    assert parse_timestamp("2024-11-11T11:11:11Z").tzinfo is timezone.utc
+    assert parse_timestamp("2024-11-11T11:11:11Z") is parse_timestamp(
+        "2024-11-11T11:11:11Z"
+    )
+    assert parse_timestamp("2024-11-11T11:11:11") == datetime(2024, 11, 11, 11, 11, 11)
+
+    for value in ("2023-02-29T00:00:00Z", "2024-11-11T11:11: 1Z", "not a time"):
+        with pytest.raises(ValueError):
+            parse_timestamp(value)
+
+
+def test_format_timestamp():
+    """Test formatting matches strftime, also for naive and other zones."""
+    for value in (
+        datetime(2024, 11, 11, 11, 11, 11, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, 678000),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        # Equal to the previous instant, but formatted with another wall time.
+        datetime(2024, 1, 2, 5, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+        datetime(999, 1, 2, 3, 4, 5),
+    ):
+        assert format_timestamp(value) == value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_archive_readings(reading_json):
+    """Create readings of two meters, one per minute."""
+    readings = []
+    for minute in range(6):
+        data = copy.deepcopy(reading_json)
+        data["meter"]["number"] = "1ISK0000000000" if minute % 2 else "1ISK0000000001"
+        data["meter"]["reading"]["time"] = f"2024-11-11T11:0{minute}:00Z"
+        readings.append(Reading.from_json(json.dumps(data)))
+    return readings
+
+
+@pytest.mark.parametrize("name", ["readings.ndjson", "readings.ndjson.gz"])
+def test_archive_round_trip(tmp_path, reading_json, status_json, name):
+    """Test readings and statuses are written and streamed back."""
+    readings = make_archive_readings(reading_json)
+    path = tmp_path / name
+    assert archive.write_ndjson(path, readings[:4]) == 4
+    archive.write_ndjson(path, readings[4:], append=True)
+
+    assert list(archive.read_readings(path, batch_size=4)) == readings
+    lazy = list(archive.read_readings(path, lazy=True))
+    assert [reading.get_current_power() for reading in lazy] == [100] * 6
+
+    batch = archive.read_reading_batch(path)
+    assert batch.to_readings() == readings
+    if name.endswith(".gz"):
+        with open(path, "rb") as file:
+            assert file.read(2) == b"\x1f\x8b"
+
+    status_path = tmp_path / "status.ndjson"
+    status = Status.from_json(json.dumps(status_json))
+    archive.write_ndjson(status_path, [json.dumps(status_json), status])
+    statuses = list(archive.read_statuses(status_path))
+    assert statuses[0] == statuses[1]
+    assert statuses[0].device.core.battery_level == 100
+
+
+def test_archive_filters(tmp_path, reading_json):
+    """Test filtering by time range and meter number."""
+    readings = make_archive_readings(reading_json)
+    path = tmp_path / "readings.ndjson"
+    archive.write_ndjson(path, readings)
+
+    start = datetime(2024, 11, 11, 11, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 11, 11, 11, 4, tzinfo=timezone.utc)
+    selected = list(
+        archive.read_readings(path, start=start, end=end, meter_number="1ISK0000000000")
+    )
+    assert selected == [readings[1], readings[3]]
+
+    batch = archive.read_reading_batch(path, meter_number="1ISK0000000001")
+    assert batch.numbers == ["1ISK0000000001"] * 3
+    assert not list(archive.read_readings(path, meter_number="unknown"))
+
+    with pytest.raises(ValueError):
+        archive.write_ndjson(path, ["{\n}"])
+    with pytest.raises(ValueError):
+        archive.open_archive(path, compression="lz4")
+
+
+def test_binary_round_trip(reading_json):
+    """Test single readings and delta encoded streams round trip."""
+    readings = make_archive_readings(reading_json)
+    readings[3].meter.reading.registers.append(Register("01-00:32.07.00*ff", 1.5, "V"))
+    first = readings[0]
+
+    encoded = first.to_bytes()
+    assert Reading.from_bytes(encoded) == first
+    assert len(encoded) < len(first.to_json()) / 2
+
+    for delta in (True, False):
+        assert binary.loads_readings(binary.dumps_readings(readings, delta)) == readings
+    plain = binary.dumps_readings(readings, delta=False)
+    assert len(binary.dumps_readings(readings)) < len(plain)
+
+    with pytest.raises(ValueError):
+        Reading.from_bytes(encoded[:-1])
+    with pytest.raises(ValueError):
+        binary.loads_readings(encoded)
+
+    # Delta frames need the frames before them.
+    encoder = binary.ReadingEncoder()
+    encoder.encode(readings[0])
+    frame = encoder.encode(readings[2])
+    with pytest.raises(ValueError):
+        binary.ReadingDecoder().decode(frame)
+
+
+def test_bulk_decode(reading_json, status_json):
+    """Test decoding on a process pool keeps the order of the payloads."""
+    readings = make_archive_readings(reading_json)
+    payloads = [reading.to_json() for reading in readings]
+
+    decoded = bulk.decode_readings(payloads, chunk_size=2, max_workers=2)
+    assert decoded == readings
+    assert bulk.decode_readings(payloads, max_workers=1) == readings
+    assert bulk.decode_reading_batch(payloads, chunk_size=4).to_readings() == readings
+    rows = bulk.decode_reading_rows(payloads[:1])
+    assert rows[0][:2] == ("1ISK0000000001", "2024-11-11T11:00:00Z")
+
+    no_meter = copy.deepcopy(status_json)
+    del no_meter["meter"]
+    payloads = [json.dumps(status_json), json.dumps(no_meter)] * 2
+    statuses = bulk.decode_statuses(payloads, chunk_size=1, max_workers=2)
+    assert statuses == [Status.from_json(payload) for payload in payloads]
+    assert not statuses[1].meter
+
+
+def test_bulk_decode_batch_times(monkeypatch):
+    """Test bulk decoding stores the same times as ReadingBatch in any zone."""
+    payloads = [
+        json.dumps(
+            {"meter": {"number": "1", "reading": {"time": time, "registers": []}}}
+        )
+        for time in ("2024-01-01T00:00:00", "1969-12-31T23:59:59.5Z")
+    ]
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        decoded = bulk.decode_reading_batch(payloads, max_workers=1)
+        expected = ReadingBatch.from_json(payloads)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert list(decoded.times) == list(expected.times) == [1704067200, -1]
+
+
+def test_obis_interning(reading_json):
+    """Test OBIS codes are parsed once and shared between readings."""
+    power = get_obis("01-00:10.07.00*ff")
+    assert isinstance(power, Obis)
+    assert power == "01-00:10.07.00*ff"
+    assert (power.medium, power.channel, power.indices) == (1, 0, (16, 7, 0, 255))
+    assert get_obis("1-0:1.8.0").indices == (1, 8, 0, 255)
+    assert get_obis("custom").medium is None
+    assert get_obis("".join(["01-00:10", ".07.00*ff"])) is power
+    assert copy.deepcopy(power) is power
+    assert intern_unit("".join(["W", "h"])) is intern_unit("Wh")
+
+    first = Reading.from_json(json.dumps(reading_json))
+    second = Reading.from_json(json.dumps(reading_json), lazy=True)
+    for a, b in zip(first.meter.reading.registers, second.meter.reading.registers):
+        assert a.obis is b.obis
+        assert a.unit is b.unit
+    assert first.meter.reading.registers[2].obis is Reading.CURRENT_POWER_OBIS
+    assert json.loads(first.to_json()) == reading_json
+
+
+@pytest.mark.parametrize("backend", codec.available_backends())
+def test_from_json_bytes(backend, reading_json, status_json):
+    """Test payloads are accepted as bytes and memoryview by every backend."""
+    reading_bytes = json.dumps(reading_json).encode()
+    status_bytes = json.dumps(status_json).encode()
+    expected = Reading.from_json(reading_bytes.decode())
+    try:
+        codec.set_backend(backend)
+        assert Reading.from_json(reading_bytes) == expected
+        assert Reading.from_json(memoryview(reading_bytes)) == expected
+        assert Status.from_json(memoryview(status_bytes)).meter.number == (
+            "1ISK0000000000"
+        )
+    finally:
+        codec.set_backend()
+
+
+@pytest.mark.asyncio
+async def test_get_raw():
+    """Test raw bodies are returned undecoded and cached separately."""
+    async with FakeBridge() as bridge:
+        async with bridge.client(reading_cache_ttl=60) as client:
+            raw = await client.get_current_reading_raw()
+            reading = await client.get_current_reading()
+            assert await client.get_current_reading_raw() is raw
+            assert await client.get_current_reading() is reading
+            status = await client.get_current_status_raw()
+
+    assert isinstance(raw, bytes)
+    assert Reading.from_json(raw).get_current_power() == reading.get_current_power()
+    assert Status.from_json(status).device.core.battery_level == 100
+    assert bridge.requests == 3
+
+
+def make_power_reading(epoch, power, consumption, number="1ISK0000000000"):
+    """Create a reading with power and consumption registers."""
+    registers = [Register(Reading.TOTAL_CONSUMPTION_OBIS, consumption, "Wh")]
+    if power is not None:
+        registers.append(Register(Reading.CURRENT_POWER_OBIS, power, "W"))
+    when = datetime.fromtimestamp(epoch, timezone.utc)
+    return Reading(meter=Meter(number, MeterReading(time=when, registers=registers)))
+
+
+def test_rolling_aggregator():
+    """Test window statistics are updated incrementally per reading."""
+    aggregator = aggregate.RollingAggregator(windows=(30, 3600))
+    samples = [(0, 100, 10.0), (10, 300, 12.0), (20, 200, 13.0), (30, None, 1.0)]
+    for epoch, power, consumption in samples:
+        assert aggregator.add(make_power_reading(epoch, power, consumption))
+    aggregator.add(make_power_reading(5, 50, 0.0, number="other"))
+
+    # The reading at 0 has left the 30 second window.
+    short = aggregator.stats("1ISK0000000000", 30)
+    assert (short.start, short.end, short.count) == (10, 30, 2)
+    assert (short.min_power, short.max_power, short.mean_power) == (200, 300, 250)
+    assert short.consumption == 2.0  # 1 Wh and 1 Wh counted after the reset
+
+    long = aggregator.stats("1ISK0000000000", 3600)
+    assert (long.min_power, long.max_power, long.count) == (100, 300, 3)
+    assert long.consumption == 4.0
+    assert long.production is None
+
+    # Repeated readings are ignored.
+    assert not aggregator.add(make_power_reading(30, 1000, 2.0))
+    assert aggregator.stats("other", 30).max_power == 50
+    with pytest.raises(KeyError):
+        aggregator.stats("1ISK0000000000", 60)
+
+    aggregator.add(make_power_reading(100, 400, 2.0))
+    short = aggregator.stats("1ISK0000000000", 30)
+    assert (short.count, short.min_power, short.consumption) == (1, 400, 0.0)
+
+
+def test_rolling_aggregator_naive_times(monkeypatch):
+    """Test naive reading times are taken as UTC in any local zone."""
+    reading = make_power_reading(1704067200, 100, 1.0)
+    reading.meter.reading.time = reading.meter.reading.time.replace(tzinfo=None)
+    aggregator = aggregate.RollingAggregator(windows=(60,))
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        aggregator.add(reading)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert aggregator.stats("1ISK0000000000", 60).end == 1704067200
+
+
+def test_rolling_window_buckets():
+    """Test long windows keep bounded buckets instead of every reading."""
+    window = aggregate.RollingWindow(3600, buckets=60)
+    for second in range(30, 7230):
+        window.push(second, second, second / 10, None)
+
+    # One-minute buckets, the oldest one is kept while it has newer readings.
+    assert len(window._buckets) == 61  # pylint: disable=protected-access
+    stats = window.stats()
+    assert (stats.start, stats.end, stats.count) == (3600, 7229, 3630)
+    assert (stats.min_power, stats.max_power) == (3600, 7229)
+    assert stats.mean_power == pytest.approx((3600 + 7229) / 2)
+    assert stats.consumption == pytest.approx(362.9)
+
+
+def test_sync_client():
+    """Test the sync client shares one loop and session between threads."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    bridge = FakeBridge()
+    asyncio.run_coroutine_threadsafe(bridge.start(), loop).result()
+    try:
+        with IOmeterSyncClient(bridge.host, port=bridge.port) as client:
+            session = client.client.session
+            with ThreadPoolExecutor(4) as pool:
+                powers = list(
+                    pool.map(
+                        lambda _: client.get_current_reading().get_current_power(),
+                        range(8),
+                    )
+                )
+            status = client.get_current_status()
+            assert client.client.session is session
+        assert session.closed
+        assert powers == [360] * 8
+        assert status.device.core.battery_level == 100
+
+        # The client starts again on the next call.
+        assert client.get_current_reading_raw()
+        client.close()
+    finally:
+        asyncio.run_coroutine_threadsafe(bridge.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    with pytest.raises(IOmeterConnectionError):
+        with IOmeterSyncClient(bridge.host, port=bridge.port) as client:
+            client.get_current_status()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_batches(tmp_path, reading_json, status_json):
+    """Test items are flushed in batches by size and to every sink."""
+    readings = (
+        make_archive_readings(reading_json) + make_archive_readings(reading_json)[:1]
+    )
+    status = Status.from_json(json.dumps(status_json))
+    batches = []
+    path = tmp_path / "pipeline.ndjson"
+    pipeline = WriterPipeline(
+        [CallbackSink(lambda items: batches.append(list(items))), NDJSONSink(path)],
+        max_batch_size=3,
+        flush_interval=10,
+    )
+    async with pipeline:
+        for reading in readings:
+            await pipeline.put(reading)
+        await pipeline.put(status)
+
+    assert [len(batch) for batch in batches] == [3, 3, 2]
+    assert batches[-1][-1] is status
+    assert pipeline.stats.items == 8
+    assert pipeline.stats.batches == 3
+    assert pipeline.stats.failures == 0
+    assert pipeline.stats.mean_flush_latency is not None
+    lines = list(archive.iter_lines(path))
+    assert [Reading.from_json(line) for line in lines[:7]] == readings
+    assert Status.from_json(lines[7]) == status
+    with pytest.raises(RuntimeError):
+        await pipeline.put(status)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_flush_interval(reading_json):
+    """Test an incomplete batch is flushed after the flush interval."""
+    flushed = asyncio.Event()
+
+    async def callback(items):
+        flushed.set()
+
+    reading = Reading.from_json(json.dumps(reading_json))
+    async with WriterPipeline([CallbackSink(callback)], flush_interval=0.05) as pipe:
+        await pipe.put(reading)
+        await asyncio.wait_for(flushed.wait(), 1)
+        assert pipe.stats.items == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_backpressure(reading_json):
+    """Test a slow sink fills the bounded queue and errors are counted."""
+    release = asyncio.Event()
+
+    async def callback(items):
+        await release.wait()
+        raise OSError("store unavailable")
+
+    reading = Reading.from_json(json.dumps(reading_json))
+    pipeline = WriterPipeline(
+        [CallbackSink(callback)], max_batch_size=1, max_queue_size=2
+    )
+    await pipeline.start()
+    pipeline.put_nowait(reading)
+    await asyncio.sleep(0)  # The writer takes the first item.
+    pipeline.put_nowait(reading)
+    pipeline.put_nowait(reading)
+    with pytest.raises(asyncio.QueueFull):
+        pipeline.put_nowait(reading)
+    assert pipeline.stats.max_queue_depth == 2
+
+    release.set()
+    await pipeline.close()
+    assert pipeline.stats.items == 3
+    assert pipeline.stats.failures == 3
+    assert isinstance(pipeline.stats.last_error, OSError)
+
+
+def test_line_protocol(reading_json, status_json):
+    """Test readings and statuses in the line protocol."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    assert to_line_protocol(reading) == (
+        "iometer,meter=1ISK0000000000 power=100.0,consumption=1234.5,"
+        "production=5432.1 1731323471000000000"
+    )
+    status = Status.from_json(json.dumps(status_json))
+    line = to_line_protocol(status, "my meter")
+    assert line.startswith("my\\ meter_status,meter=")
+    assert 'connection_status="connected"' in line
+
+
+@pytest.mark.asyncio
+async def test_pipeline_udp_sink(reading_json):
+    """Test the UDP sink packs lines into datagrams."""
+    loop = asyncio.get_running_loop()
+    received = asyncio.Queue()
+
+    class Receiver(asyncio.DatagramProtocol):
+        """Collect received datagrams."""
+
+        def datagram_received(self, data, addr):
+            received.put_nowait(data)
+
+    transport, _protocol = await loop.create_datagram_endpoint(
+        Receiver, local_addr=("127.0.0.1", 0)
+    )
+    port = transport.get_extra_info("sockname")[1]
+    readings = make_archive_readings(reading_json)
+    sink = UDPLineProtocolSink("127.0.0.1", port, max_datagram_size=300)
+    try:
+        async with WriterPipeline([sink]) as pipeline:
+            for reading in readings:
+                await pipeline.put(reading)
+        lines = []
+        while len(lines) < len(readings):
+            datagram = await asyncio.wait_for(received.get(), 1)
+            assert len(datagram) <= 300
+            lines += datagram.decode().splitlines()
+    finally:
+        transport.close()
+    assert lines == [to_line_protocol(reading) for reading in readings]
+
+
+class ScheduledClient:
+    """Client stand-in recording when its endpoints are polled."""
+
+    def __init__(self, host, reading, delay=0.0, log=None):
+        self.host = host
+        self.reading = reading
+        self.delay = delay
+        self.log = [] if log is None else log
+
+    async def get_current_reading(self):
+        self.log.append((self.host, READING))
+        await asyncio.sleep(self.delay)
+        return self.reading
+
+    async def get_current_status(self):
+        self.log.append((self.host, STATUS))
+        raise IOmeterConnectionError("bridge offline")
+
+
+@pytest.mark.asyncio
+async def test_scheduler_intervals(reading_json):
+    """Test endpoints are polled at their own intervals and staggered."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    clients = [ScheduledClient(f"bridge-{index}", reading) for index in range(4)]
+    targets = [
+        PollTarget(client, reading_interval=0.02, status_interval=0.2)
+        for client in clients
+    ]
+    results = []
+    async with PollScheduler(targets, results.append) as scheduler:
+        await asyncio.sleep(0.3)
+
+    readings = [result for result in results if result.endpoint == READING]
+    statuses = [result for result in results if result.endpoint == STATUS]
+    assert len(readings) > 4 * len(statuses) > 0
+    assert all(result.ok and result.value is reading for result in readings)
+    assert all(isinstance(result.error, IOmeterConnectionError) for result in statuses)
+
+    first = {}
+    for result in statuses:
+        first.setdefault(result.host, result.scheduled)
+    offsets = [first[client.host] - first["bridge-0"] for client in clients]
+    assert offsets == pytest.approx([0.0, 0.05, 0.1, 0.15])
+    assert scheduler.stats[READING].count == len(readings)
+    assert scheduler.stats[STATUS].p99 is not None
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_priority(reading_json):
+    """Test the in-flight cap starts due polls by priority and skips backlog."""
+    reading = Reading.from_json(json.dumps(reading_json))
+    log = []
+    targets = [
+        PollTarget(
+            ScheduledClient(f"bridge-{priority}", reading, delay=0.03, log=log),
+            priority=priority,
+            reading_interval=0.5,
+            status_interval=None,
+        )
+        for priority in (0, 2, 1)
+    ]
+    scheduler = PollScheduler(
+        targets, lambda result: None, max_in_flight=1, stagger=False
+    )
+    async with scheduler:
+        await asyncio.sleep(0.15)
+    assert log == [("bridge-2", READING), ("bridge-1", READING), ("bridge-0", READING)]
+    assert scheduler.stats[READING].max >= 0.06
+    assert scheduler.stats[READING].missed == 0
+
+    # A target slower than its interval skips the polls it missed.
+    target = PollTarget(
+        ScheduledClient("slow", reading, delay=0.05),
+        reading_interval=0.01,
+        status_interval=None,
+    )
+    async with PollScheduler([target], lambda result: None) as scheduler:
+        await asyncio.sleep(0.2)
+    stats = scheduler.stats[READING]
+    assert 2 <= stats.count <= 5
+    assert stats.missed >= 8
+    assert stats.max < 0.04
+
+
+@pytest.mark.asyncio
+async def test_scheduler_errors(reading_json):
+    """Test parse errors become results and callback errors are counted."""
+
+    class MalformedClient(ScheduledClient):
+        """Client whose responses cannot be parsed."""
+
+        async def get_current_reading(self):
+            raise ValueError("malformed body")
+
+    results = []
+
+    def callback(result):
+        results.append(result)
+        raise RuntimeError("consumer failed")
+
+    target = PollTarget(
+        MalformedClient("bad", None), reading_interval=0.02, status_interval=None
+    )
+    async with PollScheduler([target], callback) as scheduler:
+        await asyncio.sleep(0.1)
+
+    assert len(results) >= 3
+    assert all(isinstance(result.error, ValueError) for result in results)
+    assert scheduler.callback_failures == len(results)
+    assert isinstance(scheduler.last_callback_error, RuntimeError)
+
+
+def test_lateness_stats():
+    """Test lateness statistics and percentiles."""
+    stats = LatenessStats(maxlen=100)
+    assert stats.mean is None and stats.p99 is None
+    for value in range(200):
+        stats.observe(value / 1000)
+    assert stats.count == 200
+    assert stats.max == 0.199
+    assert stats.mean == pytest.approx(0.0995)
+    assert stats.percentile(50) == 0.149
+    assert stats.p99 == 0.198